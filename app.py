@@ -1,27 +1,152 @@
+from __future__ import annotations
+
+import time
+_IMPORTS_STARTED = time.perf_counter()
+
 import streamlit as st
-import gspread
-from google.oauth2.service_account import Credentials
 import json
 import os
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import numpy as np
+import abc
+import atexit
+import csv
 import datetime
+import functools
+import hashlib
+import importlib
+import importlib.util
+import io
+import random
 import re
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict, deque
+from contextlib import closing, contextmanager
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, List, Tuple, Iterator
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+# Plotly, gspread and google-auth are imported on first use, see LazyModule
+EAGER_IMPORT_SECONDS = time.perf_counter() - _IMPORTS_STARTED
 
 # ==================== HELPER FUNCTIONS ====================
+def import_module_timed(name: str):
+    """Import a module, recording the cost as an 'import:<name>' stage when it is not loaded yet"""
+    module = sys.modules.get(name)
+    # A module another thread is still importing is in sys.modules half-initialized;
+    # import_module waits for that import to finish instead of returning it early
+    if module is not None and not getattr(getattr(module, '__spec__', None), '_initializing', False):
+        return module
+    with get_perf_monitor().stage(f'import:{name}'):
+        return importlib.import_module(name)
+
+class LazyModule:
+    """Stand-in for a heavy module that is imported on first attribute access.
+
+    Companions are optional modules the library itself imports lazily through a bare
+    sys.modules check (plotly's orjson engine); importing them up front keeps
+    concurrent sessions from seeing them half-initialized.
+    """
+    
+    def __init__(self, name: str, companions: Tuple[str, ...] = ()):
+        self._name = name
+        self._companions = companions
+        self._module = None
+    
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            for companion in self._companions:
+                if importlib.util.find_spec(companion) is not None:
+                    import_module_timed(companion)
+            self._module = import_module_timed(self._name)
+        return getattr(self._module, attr)
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    import plotly.subplots as plotly_subplots
+else:
+    go = LazyModule("plotly.graph_objects", companions=("orjson",))
+    plotly_subplots = LazyModule("plotly.subplots", companions=("orjson",))
+
 def get_secret(key, default=None):
     """Prefer ENV (Render), then st.secrets (local), else default."""
     v = os.getenv(key)
     if v is not None:
         return v
     try:
-        return st.secrets.get(key, default)
+        # Only touch st.secrets when a secrets.toml exists; a missing file renders an st.error
+        if st.secrets.load_if_toml_exists():
+            return st.secrets.get(key, default)
     except Exception:
-        return default
+        pass
+    return default
+
+def partial_rerun(func: Callable) -> Callable:
+    """Run func as an st.fragment, so its widgets rerun only it (Streamlit >= 1.33).
+
+    On older Streamlit versions func is returned unchanged and widgets rerun the page.
+    """
+    fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+    return fragment(func) if fragment is not None else func
+
+def column_letter(col: int) -> str:
+    """Convert a 1-based column number to its A1 letter (1 -> A, 27 -> AA)"""
+    letters = ""
+    while col > 0:
+        col, remainder = divmod(col - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+class BoundedLRU:
+    """Thread-safe LRU cache bounded by entry count and by the total size of its values"""
+    
+    def __init__(self, max_entries: int, max_bytes: int, sizeof: Callable[[Any], int]):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Tuple[Any, int]]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: tuple) -> Optional[Any]:
+        """Return the value for key, or None, counting the hit or miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: tuple, value: Any):
+        """Store value and evict least recently used entries over the limits; oversized values are not stored"""
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._size_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._size_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self._size_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
 
 # ==================== CONFIGURATION ====================
 class Config:
@@ -29,6 +154,69 @@ class Config:
     SPREADSHEET_ID = get_secret("SPREADSHEET_ID", "1g3XL1EllHoWV3jhmi7gT3at6MtCNTJBo8DQ1WyWhMEo")
     SHEET_NAME = get_secret("SHEET_NAME", "Sheet1")
     
+    # Where sheet rows come from: "gsheet", "csv", "sqlite" or "fake" (simulated Sheets API)
+    DATA_SOURCE = get_secret("DATA_SOURCE", "gsheet")
+    DATA_SOURCE_PATH = get_secret("DATA_SOURCE_PATH", "")
+    DATA_SOURCE_TABLE = get_secret("DATA_SOURCE_TABLE", "trades")
+    FAKE_LATENCY_MS = float(get_secret("FAKE_LATENCY_MS", 250))
+    FAKE_JITTER_MS = float(get_secret("FAKE_JITTER_MS", 100))
+    FAKE_ERROR_RATE = float(get_secret("FAKE_ERROR_RATE", 0.0))
+    FAKE_QUOTA_PER_MINUTE = int(get_secret("FAKE_QUOTA_PER_MINUTE", 60))
+    
+    # Upstream resilience: read quota, retry budget and circuit breaker
+    SHEETS_READ_QUOTA_PER_MINUTE = int(get_secret("SHEETS_READ_QUOTA_PER_MINUTE", 60))
+    RETRY_MAX_ATTEMPTS = int(get_secret("RETRY_MAX_ATTEMPTS", 4))
+    RETRY_BASE_DELAY = float(get_secret("RETRY_BASE_DELAY", 0.5))
+    RETRY_MAX_DELAY = float(get_secret("RETRY_MAX_DELAY", 8))
+    RETRY_DEADLINE_SECONDS = float(get_secret("RETRY_DEADLINE_SECONDS", 20))
+    CIRCUIT_FAILURE_THRESHOLD = int(get_secret("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_RESET_SECONDS = float(get_secret("CIRCUIT_RESET_SECONDS", 60))
+    
+    # Seconds a cleaned snapshot is served before a background refresh is triggered
+    DATA_CACHE_TTL = int(get_secret("DATA_CACHE_TTL", 300))
+    
+    # Optional per-process worker that keeps the snapshot warm ("1" enables)
+    BACKGROUND_REFRESH = get_secret("BACKGROUND_REFRESH", "0") == "1"
+    REFRESH_INTERVAL_SECONDS = float(get_secret("REFRESH_INTERVAL_SECONDS", 120))
+    REFRESH_JITTER_SECONDS = float(get_secret("REFRESH_JITTER_SECONDS", 15))
+    
+    # "incremental" fetches only rows appended since the last sync, "full" re-downloads the sheet
+    SHEET_SYNC_MODE = get_secret("SHEET_SYNC_MODE", "incremental")
+    SHEET_SYNC_OVERLAP_ROWS = int(get_secret("SHEET_SYNC_OVERLAP_ROWS", 5))
+    SHEET_FULL_SYNC_EVERY = int(get_secret("SHEET_FULL_SYNC_EVERY", 50))
+    
+    # Snapshot tier shared by worker processes: "sqlite", "redis", "memory" (tests) or "" (off)
+    SHARED_CACHE = get_secret("SHARED_CACHE", "")
+    SHARED_CACHE_PATH = get_secret("SHARED_CACHE_PATH", ".cache/luxquant_shared.sqlite3")
+    SHARED_CACHE_URL = get_secret("SHARED_CACHE_URL", "redis://localhost:6379/0")
+    SHARED_CACHE_LEASE_SECONDS = float(get_secret("SHARED_CACHE_LEASE_SECONDS", 120))
+    
+    # Local columnar copy of the last snapshot for instant cold starts ("" disables it)
+    SNAPSHOT_PATH = get_secret("SNAPSHOT_PATH", ".cache/luxquant_snapshot.feather")
+    
+    # Serialized Plotly figures kept per process (LRU by entry count and total JSON size)
+    FIGURE_CACHE_MAX_ENTRIES = int(get_secret("FIGURE_CACHE_MAX_ENTRIES", 64))
+    FIGURE_CACHE_MAX_BYTES = int(get_secret("FIGURE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    
+    # Records table: rows per page, and sorted/searched views and formatted pages kept per snapshot
+    RECORDS_PAGE_SIZE = int(get_secret("RECORDS_PAGE_SIZE", 50))
+    RECORDS_VIEW_CACHE_ENTRIES = int(get_secret("RECORDS_VIEW_CACHE_ENTRIES", 16))
+    RECORDS_PAGE_CACHE_ENTRIES = int(get_secret("RECORDS_PAGE_CACHE_ENTRIES", 256))
+    
+    # Export downloads kept per process (LRU by entry count and total size), written in row chunks
+    EXPORT_CACHE_MAX_ENTRIES = int(get_secret("EXPORT_CACHE_MAX_ENTRIES", 32))
+    EXPORT_CACHE_MAX_BYTES = int(get_secret("EXPORT_CACHE_MAX_BYTES", 128 * 1024 * 1024))
+    EXPORT_CHUNK_ROWS = int(get_secret("EXPORT_CHUNK_ROWS", 50_000))
+    
+    # Series longer than this are downsampled before plotting (0 disables downsampling)
+    CHART_POINT_BUDGET = int(get_secret("CHART_POINT_BUDGET", 500))
+    
+    # Operator debug panel: always on with DEBUG_PANEL=1, or via ?debug=<DEBUG_PANEL_TOKEN>
+    DEBUG_PANEL = get_secret("DEBUG_PANEL", "0") == "1"
+    DEBUG_PANEL_TOKEN = get_secret("DEBUG_PANEL_TOKEN")
+    PERF_WINDOW = int(get_secret("PERF_WINDOW", 500))
+    PERF_LOG = get_secret("PERF_LOG", "1") == "1"
+    
     # Binance Color Scheme - Enhanced for better readability
     COLORS = {
         'primary': '#F0B90B',      # Binance Yellow
@@ -46,18 +234,132 @@ class Config:
         'hover': '#1E2329'         # Hover Background
     }
 
+# ==================== INSTRUMENTATION ====================
+class PerfMonitor:
+    """Per-stage timings with rolling percentiles, request traces and structured log lines"""
+    
+    def __init__(self, window: int, log_enabled: bool = True):
+        self.window = window
+        self.log_enabled = log_enabled
+        self._durations: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    @contextmanager
+    def stage(self, name: str, **fields) -> Iterator[Dict[str, Any]]:
+        """Time a block; the yielded record can be extended with rows, cache status, etc."""
+        record: Dict[str, Any] = {'stage': name, **fields}
+        stack = self._stack()
+        stack.append(record)
+        started = time.perf_counter()
+        try:
+            yield record
+        except Exception as e:
+            record['error'] = type(e).__name__
+            raise
+        finally:
+            record['duration_ms'] = round((time.perf_counter() - started) * 1000, 3)
+            stack.pop()
+            self._record(record)
+    
+    def record(self, name: str, duration_ms: float, **fields):
+        """Record a stage that was timed elsewhere"""
+        self._record({'stage': name, **fields, 'duration_ms': round(duration_ms, 3)})
+    
+    def annotate(self, **fields):
+        """Add fields to the innermost stage running in this thread"""
+        stack = self._stack()
+        if stack:
+            stack[-1].update(fields)
+    
+    @contextmanager
+    def trace(self) -> Iterator[List[Dict[str, Any]]]:
+        """Collect every stage recorded by this thread while the block runs"""
+        records: List[Dict[str, Any]] = []
+        previous = getattr(self._local, 'trace', None)
+        self._local.trace = records
+        try:
+            yield records
+        finally:
+            self._local.trace = previous
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Rolling count, p50, p95 and last duration per stage"""
+        with self._lock:
+            snapshot = {name: list(values) for name, values in self._durations.items()}
+        summary = {}
+        for name, values in sorted(snapshot.items()):
+            p50, p95 = np.percentile(values, [50, 95])
+            summary[name] = {
+                'count': len(values),
+                'p50_ms': round(float(p50), 3),
+                'p95_ms': round(float(p95), 3),
+                'last_ms': values[-1],
+            }
+        return summary
+    
+    def _stack(self) -> List[Dict[str, Any]]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+    
+    def _record(self, record: Dict[str, Any]):
+        with self._lock:
+            durations = self._durations.setdefault(record['stage'], deque(maxlen=self.window))
+            durations.append(record['duration_ms'])
+        trace = getattr(self._local, 'trace', None)
+        if trace is not None:
+            trace.append(record)
+        if self.log_enabled:
+            print(json.dumps({'event': 'perf', 'thread': threading.current_thread().name, **record}, default=str))
+
+@st.cache_resource
+def _shared_perf_monitor() -> PerfMonitor:
+    return PerfMonitor(Config.PERF_WINDOW, log_enabled=Config.PERF_LOG)
+
+def get_perf_monitor() -> PerfMonitor:
+    """Return the performance monitor shared by every session in this process.
+
+    cache_resource only finds the shared instance inside a ScriptRunContext, so
+    worker threads use the monitor start_worker_thread handed to them.
+    """
+    monitor = getattr(threading.current_thread(), 'perf_monitor', None)
+    return monitor if monitor is not None else _shared_perf_monitor()
+
+@st.cache_resource(show_spinner=False)
+def get_startup_report(_eager_import_seconds: float) -> Dict[str, float]:
+    """Record the eager import cost of the first script run in this process.
+
+    Later reruns find their modules in sys.modules, so only the first run is telling.
+    """
+    eager_ms = _eager_import_seconds * 1000
+    get_perf_monitor().record('startup_imports', eager_ms)
+    print(f"⏱️ Eager imports took {eager_ms:.0f} ms")
+    return {'eager_imports_ms': round(eager_ms, 1)}
+
+def start_worker_thread(target: Callable, name: str, args: tuple = ()) -> threading.Thread:
+    """Start a daemon thread outside any session.
+
+    Workers serve every session, so they get no ScriptRunContext: st.* output from
+    them would land in whichever session started them. Their failures are reported
+    through cache and refresher state instead.
+    """
+    thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+    thread.perf_monitor = get_perf_monitor()
+    thread.start()
+    return thread
+
 # ==================== STYLING ====================
 class StyleManager:
     """Manages all CSS styling for the application"""
     
-    @staticmethod
-    def apply_custom_css():
-        """Apply comprehensive responsive CSS styling with improved readability"""
-        st.markdown("""
-        <style>
-        /* Import Binance-like fonts */
-        @import url('https://fonts.googleapis.com/css2?family=IBM+Plex+Sans:wght@300;400;500;600;700&display=swap');
-        
+    FONT_FAMILY = "IBM Plex Sans"
+    # Self-hosted font files, served by Streamlit static serving (see .streamlit/config.toml)
+    FONT_DIR = Path(__file__).resolve().parent / "static" / "fonts"
+    FONT_URL = "app/static/fonts"
+    FONT_WEIGHTS = {300: "Light", 400: "Regular", 500: "Medium", 600: "SemiBold", 700: "Bold"}
+    
+    STYLESHEET = """
         /* Main app styling with Binance colors */
         .stApp {
             background: #0B0E11;
@@ -429,22 +731,1251 @@ class StyleManager:
                 margin: 0 auto;
             }
         }
-        </style>
-        """, unsafe_allow_html=True)
+        """
+    
+    @staticmethod
+    def apply_custom_css():
+        """Apply comprehensive responsive CSS styling with improved readability"""
+        bundle = get_css_bundle()
+        st.markdown(bundle['html'], unsafe_allow_html=True)
+    
+    @staticmethod
+    def font_face_css() -> str:
+        """@font-face rules that never block text: local copies first, then self-hosted woff2"""
+        rules = []
+        for weight, style in StyleManager.FONT_WEIGHTS.items():
+            sources = [f"local('{StyleManager.FONT_FAMILY} {style}')", f"local('IBMPlexSans-{style}')"]
+            font_file = StyleManager.FONT_DIR / f"IBMPlexSans-{style}.woff2"
+            if font_file.exists():
+                sources.append(f"url('{StyleManager.FONT_URL}/{font_file.name}') format('woff2')")
+            rules.append(
+                f"@font-face {{ font-family: '{StyleManager.FONT_FAMILY}'; font-style: normal; "
+                f"font-weight: {weight}; font-display: swap; src: {', '.join(sources)}; }}"
+            )
+        return "\n".join(rules)
+    
+    @staticmethod
+    def minify_css(css: str) -> str:
+        """Strip comments and insignificant whitespace"""
+        css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+        css = re.sub(r'\s+', ' ', css)
+        css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+        css = re.sub(r':\s+', ':', css)
+        return css.replace(';}', '}').strip()
+    
+    @staticmethod
+    def build_css_bundle() -> Dict[str, Any]:
+        """Minify the font rules and stylesheet and tag the result with its content hash"""
+        raw = StyleManager.font_face_css() + "\n" + StyleManager.STYLESHEET
+        css = StyleManager.minify_css(raw)
+        digest = hashlib.blake2b(css.encode(), digest_size=6).hexdigest()
+        return {
+            'hash': digest,
+            'html': f'<style id="luxquant-css-{digest}">{css}</style>',
+            'raw_bytes': len(raw.encode()),
+            'minified_bytes': len(css.encode()),
+            'self_hosted_font': any(StyleManager.FONT_DIR.glob("*.woff2")),
+        }
+
+@st.cache_resource(show_spinner=False)
+def get_css_bundle() -> Dict[str, Any]:
+    """Build the stylesheet once per process"""
+    return StyleManager.build_css_bundle()
+
+# ==================== DATA SOURCES ====================
+class DataSourceError(Exception):
+    """Error from a data source, with the HTTP-style status the Sheets API would return"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def parse_a1_range(a1: str) -> Tuple[int, Optional[int], int, Optional[int]]:
+    """Parse an A1 range like "A2:F", "C2:C10" or "1:1" into 0-based half-open bounds.
+
+    Returns (row_start, row_stop, col_start, col_stop); a None stop is unbounded.
+    """
+    a1 = a1.split('!')[-1]
+    bounds = []
+    for part in a1.split(':'):
+        match = re.fullmatch(r'([A-Za-z]*)(\d*)', part.strip())
+        if match is None or not (match.group(1) or match.group(2)):
+            raise ValueError(f"Invalid A1 range: {a1}")
+        letters, digits = match.groups()
+        col = 0
+        for letter in letters.upper():
+            col = col * 26 + ord(letter) - 64
+        bounds.append((int(digits) if digits else None, col or None))
+    (start_row, start_col), (end_row, end_col) = bounds[0], bounds[-1]
+    return (
+        (start_row or 1) - 1, end_row,
+        (start_col or 1) - 1, end_col,
+    )
+
+class DataSource(abc.ABC):
+    """Row source consumed by DataManager, mirroring the gspread Worksheet read calls"""
+    
+    name = "base"
+    
+    def connect(self):
+        """Open the underlying connection ahead of the first read"""
+    
+    def reset(self):
+        """Drop the open connection so the next call opens a new one"""
+    
+    @abc.abstractmethod
+    def get_all_values(self) -> List[List[str]]:
+        """Every row up to the last non-empty one, padded to a rectangle"""
+    
+    @abc.abstractmethod
+    def batch_get(self, ranges: List[str]) -> List[List[List[str]]]:
+        """Values of several A1 ranges; rows and cells are trimmed like the Sheets API"""
+
+class GSheetSource(DataSource):
+    """Google Sheets worksheet opened through DataManager.connect_to_gsheet.
+
+    The worksheet is kept here too: in worker threads, which have no ScriptRunContext,
+    the cache_resource behind connect would authorize a new client on every call.
+    """
+    
+    name = "gsheet"
+    
+    def __init__(self, connect: Callable[[], Any]):
+        self._connect = connect
+        self._worksheet = None
+    
+    def connect(self):
+        if self._worksheet is None:
+            self._worksheet = self._connect()
+        return self._worksheet
+    
+    def reset(self):
+        self._worksheet = None
+    
+    def get_all_values(self) -> List[List[str]]:
+        return self.connect().get_all_values()
+    
+    def batch_get(self, ranges: List[str]) -> List[List[List[str]]]:
+        return self.connect().batch_get(ranges)
+
+class LocalRowsSource(DataSource):
+    """Base for local sources: serves A1 reads from an in-memory grid of strings"""
+    
+    @abc.abstractmethod
+    def _read_rows(self) -> List[List[str]]:
+        """The whole grid as lists of strings, as stored"""
+    
+    def get_all_values(self) -> List[List[str]]:
+        rows = self._trim_rows(self._read_rows())
+        width = max((len(row) for row in rows), default=0)
+        return [list(row) + [''] * (width - len(row)) for row in rows]
+    
+    def batch_get(self, ranges: List[str]) -> List[List[List[str]]]:
+        rows = self._read_rows()
+        results = []
+        for a1 in ranges:
+            row_start, row_stop, col_start, col_stop = parse_a1_range(a1)
+            window = [row[col_start:col_stop] for row in rows[row_start:row_stop]]
+            results.append(self._trim_rows(window))
+        return results
+    
+    @staticmethod
+    def _trim_rows(rows: List[List[str]]) -> List[List[str]]:
+        """Drop trailing empty cells and rows, as the Sheets values API does"""
+        trimmed = []
+        for row in rows:
+            row = list(row)
+            while row and row[-1] == '':
+                row.pop()
+            trimmed.append(row)
+        while trimmed and not trimmed[-1]:
+            trimmed.pop()
+        return trimmed
+
+class InMemorySource(LocalRowsSource):
+    """Rows held in memory, e.g. synthetic sheets for benchmarks and load tests"""
+    
+    name = "memory"
+    
+    def __init__(self, rows: List[List[str]]):
+        self.rows = rows
+    
+    def _read_rows(self) -> List[List[str]]:
+        return self.rows
+
+class CsvSource(LocalRowsSource):
+    """CSV export of the sheet; re-read whenever the file changes"""
+    
+    name = "csv"
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._rows: List[List[str]] = []
+        self._mtime: Optional[float] = None
+    
+    def _read_rows(self) -> List[List[str]]:
+        mtime = self.path.stat().st_mtime
+        if mtime != self._mtime:
+            with open(self.path, newline='', encoding='utf-8') as f:
+                self._rows = [list(row) for row in csv.reader(f)]
+            self._mtime = mtime
+        return self._rows
+
+class SqliteSource(LocalRowsSource):
+    """SQLite table whose columns are the sheet header, in insertion order"""
+    
+    name = "sqlite"
+    
+    def __init__(self, path: str, table: str):
+        self.path = path
+        self.table = table
+    
+    def _read_rows(self) -> List[List[str]]:
+        with sqlite3.connect(self.path) as conn:
+            cursor = conn.execute(f'SELECT * FROM "{self.table}" ORDER BY rowid')
+            header = [column[0] for column in cursor.description]
+            rows = [['' if value is None else str(value) for value in row] for row in cursor]
+        return [header] + rows
+
+class FakeSheetsSource(DataSource):
+    """Wraps another source with Sheets-like latency, jitter, random errors and quota throttling"""
+    
+    name = "fake"
+    
+    def __init__(self, inner: DataSource, latency_ms: float = 250, jitter_ms: float = 100,
+                 error_rate: float = 0.0, quota_per_minute: int = 60, seed: Optional[int] = None):
+        self.inner = inner
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.request_count = 0
+        self.throttled_count = 0
+        self.error_count = 0
+        self._requests: deque = deque()
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+    
+    def get_all_values(self) -> List[List[str]]:
+        self._simulate_request()
+        return self.inner.get_all_values()
+    
+    def batch_get(self, ranges: List[str]) -> List[List[List[str]]]:
+        self._simulate_request()
+        return self.inner.batch_get(ranges)
+    
+    def _simulate_request(self):
+        """Sleep for the simulated round trip, then enforce the per-minute quota and error rate"""
+        with self._lock:
+            self.request_count += 1
+            delay_ms = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+            fail = self._random.random() < self.error_rate
+            now = time.monotonic()
+            while self._requests and now - self._requests[0] >= 60:
+                self._requests.popleft()
+            throttled = self.quota_per_minute > 0 and len(self._requests) >= self.quota_per_minute
+            if throttled:
+                self.throttled_count += 1
+            else:
+                self._requests.append(now)
+        
+        time.sleep(delay_ms / 1000)
+        if throttled:
+            raise DataSourceError("Quota exceeded for 'Read requests per minute per user'", status_code=429)
+        if fail:
+            with self._lock:
+                self.error_count += 1
+            raise DataSourceError("The service is currently unavailable", status_code=503)
+
+class CircuitOpenError(DataSourceError):
+    """Raised without calling upstream while the circuit breaker is open"""
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+AUTH_STATUS_CODES = {401, 403}
+
+def classify_error(error: BaseException) -> str:
+    """Sort an upstream error into 'retryable', 'auth' or 'fatal'"""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        # gspread.exceptions.APIError keeps the HTTP response
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status in AUTH_STATUS_CODES:
+        return 'auth'
+    if status in RETRYABLE_STATUS_CODES:
+        return 'retryable'
+    if type(error).__name__ == 'RefreshError':
+        # google.auth token refresh failed: revoked key or clock skew
+        return 'auth'
+    if isinstance(error, (ConnectionError, TimeoutError)) or type(error).__module__.startswith(('requests.', 'urllib3.')):
+        return 'retryable'
+    return 'fatal'
+
+class TokenBucket:
+    """Blocking token-bucket rate limiter.
+
+    Burst capacity plus one minute of refill never exceeds the per-minute quota,
+    so a sliding-window quota like the Sheets API's is never tripped from here.
+    """
+
+    def __init__(self, quota_per_minute: int, burst: Optional[int] = None):
+        self.capacity = max(1, burst if burst is not None else quota_per_minute // 10)
+        self.rate = max(quota_per_minute - self.capacity, 1) / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float) -> bool:
+        """Take one token, waiting up to timeout seconds; False when none became available"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def available(self) -> float:
+        """Tokens currently available, for health reporting"""
+        with self._lock:
+            elapsed = time.monotonic() - self._updated
+            return min(self.capacity, self._tokens + elapsed * self.rate)
+
+class CircuitBreaker:
+    """Opens after consecutive failures, then lets one trial call through after a cool-down"""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; half-open admits a single trial call"""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                if self.opened_at is None or self._trial_running:
+                    print(f"⚠️ Circuit opened after {self.failures} consecutive upstream failures")
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+class ResilientSource(DataSource):
+    """Rate limiting, retries with backoff and a circuit breaker around another source.
+
+    Retryable errors (429, 5xx, network) are retried with exponential backoff and
+    full jitter inside a fixed deadline. Auth errors reset the cached client once
+    via on_auth_failure. While the circuit is open calls fail fast, so the snapshot
+    cache keeps serving the last good snapshot.
+    """
+
+    def __init__(self, inner: DataSource, limiter: TokenBucket, breaker: CircuitBreaker,
+                 max_attempts: int = 4, base_delay: float = 0.5, max_delay: float = 8.0,
+                 deadline_seconds: float = 20.0, on_auth_failure: Optional[Callable[[], None]] = None):
+        self.inner = inner
+        self.name = inner.name
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline_seconds = deadline_seconds
+        self.on_auth_failure = on_auth_failure
+        self.last_error: Optional[str] = None
+        self.counters = {'calls': 0, 'retries': 0, 'failures': 0, 'rejected': 0, 'auth_resets': 0}
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def connect(self):
+        # Opening a (usually cached) client is not a values read: it spends no quota
+        # and its success says nothing about upstream health
+        return self._call(self.inner.connect, read=False)
+
+    def get_all_values(self) -> List[List[str]]:
+        return self._call(self.inner.get_all_values)
+
+    def batch_get(self, ranges: List[str]) -> List[List[List[str]]]:
+        return self._call(lambda: self.inner.batch_get(ranges))
+
+    def stats(self) -> Dict[str, Any]:
+        """Limiter, breaker and retry counters for the debug panel"""
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            'circuit': self.breaker.state,
+            'consecutive_failures': self.breaker.failures,
+            'tokens_available': round(self.limiter.available(), 2),
+            'last_error': self.last_error,
+            **counters,
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def _call(self, fn: Callable[[], Any], read: bool = True) -> Any:
+        # Only reads may take the single half-open trial call
+        allowed = self.breaker.allow() if read else self.breaker.state != CircuitBreaker.OPEN
+        if not allowed:
+            self._count('rejected')
+            raise CircuitOpenError("Upstream is unavailable; serving the last good snapshot", status_code=503)
+
+        self._count('calls')
+        deadline = time.monotonic() + self.deadline_seconds
+        auth_reset = False
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                if read and not self.limiter.acquire(max(0.0, deadline - time.monotonic())):
+                    raise DataSourceError("Local read quota exhausted", status_code=429)
+                result = fn()
+            except Exception as e:
+                kind = classify_error(e)
+                self.last_error = f"{type(e).__name__}: {e}"
+                if kind == 'auth' and not auth_reset and self.on_auth_failure is not None:
+                    auth_reset = True
+                    self._count('auth_resets')
+                    print(f"🔑 Auth failure, re-creating the Sheets client: {e}")
+                    self.on_auth_failure()
+                    continue
+
+                delay = self._backoff(attempt)
+                if kind != 'retryable' or attempt >= self.max_attempts or time.monotonic() + delay > deadline:
+                    self._count('failures')
+                    self.breaker.record_failure()
+                    get_perf_monitor().annotate(attempts=attempt)
+                    raise
+
+                self._count('retries')
+                print(f"🔁 Retrying upstream call in {delay:.2f}s (attempt {attempt}): {e}")
+                time.sleep(delay)
+                continue
+
+            if read:
+                self.breaker.record_success()
+            if attempt > 1:
+                get_perf_monitor().annotate(attempts=attempt)
+            return result
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+def create_data_source(connect_to_gsheet: Callable[[], Any]) -> DataSource:
+    """Build the data source selected by Config.DATA_SOURCE"""
+    kind = Config.DATA_SOURCE
+    if kind == 'gsheet':
+        return GSheetSource(connect_to_gsheet)
+    
+    path = Config.DATA_SOURCE_PATH
+    if not path:
+        raise ValueError(f"DATA_SOURCE={kind} requires DATA_SOURCE_PATH")
+    if kind == 'csv':
+        return CsvSource(path)
+    if kind == 'sqlite':
+        return SqliteSource(path, Config.DATA_SOURCE_TABLE)
+    if kind == 'fake':
+        # The simulated API wraps a local file; its extension picks the reader
+        inner: DataSource = (
+            SqliteSource(path, Config.DATA_SOURCE_TABLE)
+            if path.endswith(('.db', '.db3', '.sqlite', '.sqlite3')) else CsvSource(path)
+        )
+        return FakeSheetsSource(
+            inner,
+            latency_ms=Config.FAKE_LATENCY_MS,
+            jitter_ms=Config.FAKE_JITTER_MS,
+            error_rate=Config.FAKE_ERROR_RATE,
+            quota_per_minute=Config.FAKE_QUOTA_PER_MINUTE,
+        )
+    raise ValueError(f"Unknown DATA_SOURCE: {kind}")
+
+def create_resilient_source(source: DataSource, on_auth_failure: Optional[Callable[[], None]] = None) -> ResilientSource:
+    """Wrap a source with the Config quota, retry and circuit breaker settings"""
+    return ResilientSource(
+        source,
+        limiter=TokenBucket(Config.SHEETS_READ_QUOTA_PER_MINUTE),
+        breaker=CircuitBreaker(Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_SECONDS),
+        max_attempts=Config.RETRY_MAX_ATTEMPTS,
+        base_delay=Config.RETRY_BASE_DELAY,
+        max_delay=Config.RETRY_MAX_DELAY,
+        deadline_seconds=Config.RETRY_DEADLINE_SECONDS,
+        on_auth_failure=on_auth_failure,
+    )
+
+@st.cache_resource
+def get_data_source() -> DataSource:
+    """Return the configured data source shared by every session in this process"""
+    source = create_data_source(DataManager().connect_to_gsheet)
+
+    def reset_client():
+        DataManager.connect_to_gsheet.clear()
+        source.reset()
+
+    return create_resilient_source(source, on_auth_failure=reset_client)
+
+# ==================== SNAPSHOT CACHE ====================
+class DiskSnapshot:
+    """Feather file holding the last cleaned snapshot plus a versioned metadata header"""
+
+    # Bump whenever the layout of the cleaned DataFrame changes
+    FORMAT_VERSION = 2
+    METADATA_KEY = b'luxquant_snapshot'
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def load(self) -> Optional[Tuple[pd.DataFrame, datetime.datetime, Optional[Dict[str, Any]]]]:
+        """Load the snapshot with memory-mapped reads; unusable files are removed"""
+        if not self.path.exists():
+            return None
+        try:
+            from pyarrow import feather
+
+            table = feather.read_table(str(self.path), memory_map=True)
+            header = json.loads((table.schema.metadata or {})[self.METADATA_KEY])
+            if header.get('format_version') != self.FORMAT_VERSION:
+                raise ValueError(f"format version {header.get('format_version')} != {self.FORMAT_VERSION}")
+            if table.column_names != header.get('columns'):
+                raise ValueError("column layout does not match header")
+
+            df = table.to_pandas()
+            fetched_at = datetime.datetime.fromisoformat(header['fetched_at'])
+            print(f"✅ Loaded snapshot from {self.path} ({len(df)} rows)")
+            return df, fetched_at, header.get('sync_state')
+        except Exception as e:
+            print(f"❌ Discarding unusable snapshot file {self.path}: {e}")
+            self.discard()
+            return None
+
+    def save(self, df: pd.DataFrame, fetched_at: datetime.datetime,
+             sync_state: Optional[Dict[str, Any]] = None):
+        """Write the snapshot atomically; failures are logged, never raised"""
+        try:
+            import pyarrow as pa
+            from pyarrow import feather
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            header = {
+                'format_version': self.FORMAT_VERSION,
+                'fetched_at': fetched_at.isoformat(),
+                'columns': table.column_names,
+                'sync_state': sync_state,
+            }
+            metadata = dict(table.schema.metadata or {})
+            metadata[self.METADATA_KEY] = json.dumps(header).encode('utf-8')
+            table = table.replace_schema_metadata(metadata)
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            # Uncompressed so reads can be memory-mapped
+            feather.write_feather(table, str(tmp_path), compression='uncompressed')
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"❌ Error writing snapshot file {self.path}: {e}")
+
+    def discard(self):
+        """Remove the snapshot file so the next refresh rebuilds it"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"❌ Error removing snapshot file {self.path}: {e}")
+
+class InMemoryStore:
+    """Process-local stand-in for the Redis commands SharedSnapshotStore uses (GET, SET NX PX, DEL)"""
+
+    def __init__(self):
+        self._values: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[bytes]:
+        """Value for key unless it has expired (lock held)"""
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(key)
+
+    def set(self, key: str, value: bytes, nx: bool = False, px: Optional[int] = None) -> Optional[bool]:
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            expires_at = time.monotonic() + px / 1000 if px else None
+            self._values[key] = (bytes(value), expires_at)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._values.pop(key, None) is not None for key in keys)
+
+class SqliteStore:
+    """The same key/value commands on a SQLite file that every worker on a host can open"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per call keeps the store safe to share between threads
+        return sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, nx: bool = False, px: Optional[int] = None) -> Optional[bool]:
+        now = time.time()
+        expires_at = now + px / 1000 if px else None
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if nx:
+                    conn.execute("DELETE FROM kv WHERE key = ? AND expires_at <= ?", (key, now))
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, sqlite3.Binary(value), expires_at)
+                    ).rowcount
+                    conn.execute("COMMIT")
+                    return True if inserted else None
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, sqlite3.Binary(value), expires_at)
+                )
+                conn.execute("COMMIT")
+                return True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, *keys: str) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                f"DELETE FROM kv WHERE key IN ({','.join('?' * len(keys))})", keys
+            ).rowcount
+
+class SharedSnapshotStore:
+    """Versioned snapshots in a key/value store shared by every worker process.
+
+    Each snapshot is written under its own version key before the `current` pointer
+    is moved to it, so readers always see a complete snapshot. A lease key elects
+    the single worker allowed to fetch from the source; the others adopt what it
+    publishes. Any client with Redis GET / SET NX PX / DEL semantics works.
+    """
+
+    def __init__(self, client: Any, max_age_seconds: float, lease_seconds: float,
+                 namespace: str = "luxquant:snapshot", backend: str = "redis"):
+        self.client = client
+        self.max_age_seconds = max_age_seconds
+        self.lease_seconds = lease_seconds
+        self.namespace = namespace
+        self.backend = backend
+        self.published = 0
+        self.adopted = 0
+        self.lease_conflicts = 0
+
+    def _key(self, suffix: str) -> str:
+        return f"{self.namespace}:{suffix}"
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """Metadata of the published snapshot: version, fetched_at and sync_state"""
+        raw = self.client.get(self._key('current'))
+        if raw is None:
+            return None
+        meta = json.loads(raw)
+        if meta.get('format_version') != DiskSnapshot.FORMAT_VERSION:
+            return None
+        meta['fetched_at'] = datetime.datetime.fromisoformat(meta['fetched_at'])
+        return meta
+
+    def is_fresh(self, meta: Dict[str, Any]) -> bool:
+        age = (datetime.datetime.now() - meta['fetched_at']).total_seconds()
+        return age < self.max_age_seconds
+
+    def load(self, version: int) -> Optional[pd.DataFrame]:
+        """Decode a published snapshot, None when it has already been replaced and removed"""
+        blob = self.client.get(self._key(f"v{version}"))
+        if blob is None:
+            return None
+        from pyarrow import feather
+        import pyarrow as pa
+
+        self.adopted += 1
+        return feather.read_table(pa.BufferReader(blob)).to_pandas()
+
+    def publish(self, df: pd.DataFrame, fetched_at: datetime.datetime,
+                sync_state: Optional[Dict[str, Any]], changed: bool = True) -> int:
+        """Write df as the next version and point `current` at it.
+
+        An unchanged frame only refreshes the timestamp of the current version.
+        """
+        meta = self.current()
+        version = meta['version'] if meta is not None else 0
+        if changed or meta is None:
+            import pyarrow as pa
+            from pyarrow import feather
+
+            version += 1
+            sink = pa.BufferOutputStream()
+            feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), sink, compression='lz4')
+            self.client.set(self._key(f"v{version}"), sink.getvalue().to_pybytes())
+        self.client.set(self._key('current'), json.dumps({
+            'format_version': DiskSnapshot.FORMAT_VERSION,
+            'version': version,
+            'fetched_at': fetched_at.isoformat(),
+            'sync_state': sync_state,
+        }).encode('utf-8'))
+        if changed and version > 2:
+            # The previous version stays readable for workers that are loading it right now
+            self.client.delete(self._key(f"v{version - 2}"))
+        self.published += 1
+        return version
+
+    def wait_for_publish(self, seen_version: Optional[int], poll_seconds: float = 0.25
+                         ) -> Optional[Dict[str, Any]]:
+        """Wait while another worker holds the lease for a version newer than seen_version"""
+        deadline = time.monotonic() + self.lease_seconds
+        while time.monotonic() < deadline:
+            meta = self.current()
+            if meta is not None and meta['version'] != seen_version:
+                return meta
+            if self.client.get(self._key('lease')) is None:
+                return meta
+            time.sleep(poll_seconds)
+        return None
+
+    def acquire_lease(self) -> Optional[str]:
+        """Try to become the refresher; returns a token to release, None if another worker holds it"""
+        token = f"{os.getpid()}:{threading.get_ident()}:{random.random()}"
+        if self.client.set(self._key('lease'), token.encode('utf-8'), nx=True,
+                           px=int(self.lease_seconds * 1000)):
+            return token
+        self.lease_conflicts += 1
+        return None
+
+    def release_lease(self, token: str):
+        """Give up the lease if this worker still holds it"""
+        holder = self.client.get(self._key('lease'))
+        if holder is not None and holder.decode('utf-8') == token:
+            self.client.delete(self._key('lease'))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the debug panel"""
+        return {
+            'backend': self.backend,
+            'published': self.published,
+            'adopted': self.adopted,
+            'lease_conflicts': self.lease_conflicts,
+        }
+
+def create_shared_store() -> Optional[SharedSnapshotStore]:
+    """Build the shared snapshot tier selected by Config.SHARED_CACHE, None when disabled"""
+    backend = Config.SHARED_CACHE
+    if not backend:
+        return None
+    if backend == 'sqlite':
+        client = SqliteStore(Config.SHARED_CACHE_PATH)
+    elif backend == 'redis':
+        import redis
+
+        client = redis.Redis.from_url(Config.SHARED_CACHE_URL)
+    elif backend == 'memory':
+        client = InMemoryStore()
+    else:
+        raise ValueError(f"Unknown SHARED_CACHE backend: {backend}")
+
+    # Followers adopt anything younger than the refresh cadence
+    max_age = Config.DATA_CACHE_TTL
+    if Config.BACKGROUND_REFRESH:
+        max_age = min(max_age, Config.REFRESH_INTERVAL_SECONDS)
+    print(f"🤝 Sharing snapshots through {backend}")
+    return SharedSnapshotStore(client, max_age, Config.SHARED_CACHE_LEASE_SECONDS, backend=backend)
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller runs the function; callers arriving while it is in flight wait
+    and receive the same result, or have the same exception raised.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result: Any = None
+            self.error: Optional[BaseException] = None
+            self.waiters = 0
+
+    def __init__(self):
+        self.executions = 0
+        self.coalesced = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[str, "SingleFlight._Call"] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn for key unless a call for key is already in flight, then share its outcome"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+                self.executions += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if not leader:
+            get_perf_monitor().annotate(coalesced=True)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed"""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the debug panel"""
+        with self._lock:
+            return {
+                'executions': self.executions,
+                'coalesced': self.coalesced,
+                'failures': self.failures,
+                'in_flight': len(self._calls),
+            }
+
+class SnapshotCache:
+    """Process-wide cache of the cleaned DataFrame with stale-while-revalidate refresh"""
+
+    def __init__(self, ttl_seconds: int, disk: Optional[DiskSnapshot] = None,
+                 warmers: Optional[Dict[str, Callable[[pd.DataFrame, Dict[str, Any]], Any]]] = None,
+                 shared: Optional[SharedSnapshotStore] = None):
+        self.ttl_seconds = ttl_seconds
+        self.disk = disk
+        self.shared = shared
+        self.shared_version: Optional[int] = None
+        self.warmers = warmers or {}
+        self.version = 0
+        self.last_error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._df: Optional[pd.DataFrame] = None
+        self._sync_state: Optional[Dict[str, Any]] = None
+        self._fetched_at: Optional[datetime.datetime] = None
+        self._refreshing = False
+        self._disk_checked = False
+        self._needs_reconcile = False
+        self._derived: Dict[str, Any] = {}
+        self.flight = SingleFlight()
+
+    @property
+    def fetched_at(self) -> Optional[datetime.datetime]:
+        """Time the current snapshot was fetched from the source"""
+        return self._fetched_at
+
+    @property
+    def refreshing(self) -> bool:
+        """Whether a background refresh is currently running"""
+        return self._refreshing
+
+    def age_seconds(self) -> Optional[float]:
+        """Age of the current snapshot in seconds, None when empty"""
+        if self._fetched_at is None:
+            return None
+        return (datetime.datetime.now() - self._fetched_at).total_seconds()
+
+    def memory_bytes(self) -> Optional[int]:
+        """Deep memory footprint of the current snapshot"""
+        df = self._df
+        return int(df.memory_usage(deep=True).sum()) if df is not None else None
+
+    def get(self, loader: "SnapshotLoader") -> Optional[pd.DataFrame]:
+        """Return the cached snapshot, loading synchronously only when nothing is cached yet.
+
+        A stale snapshot is returned immediately while a single background refresh runs.
+        On a cold start the on-disk snapshot is served and reconciled in the background.
+        """
+        with self._lock:
+            if self._df is None and self.disk is not None and not self._disk_checked:
+                self._disk_checked = True
+                self._restore_from_disk()
+
+            df = self._df
+            age = self.age_seconds()
+            start_refresh = (
+                df is not None and age is not None and not self._refreshing
+                and (age >= self.ttl_seconds or self._needs_reconcile)
+            )
+            if start_refresh:
+                self._refreshing = True
+                self._needs_reconcile = False
+
+        monitor = get_perf_monitor()
+        if df is None:
+            monitor.annotate(cache='miss')
+            return self.refresh(loader)
+
+        monitor.annotate(cache='stale' if start_refresh or self._refreshing else 'hit', rows=len(df))
+        if start_refresh:
+            start_worker_thread(self._background_refresh, "snapshot-refresh", args=(loader,))
+        return df
+
+    def refresh(self, loader: "SnapshotLoader") -> Optional[pd.DataFrame]:
+        """Load a fresh snapshot and swap it in; exceptions propagate to the caller.
+
+        Concurrent refreshes (cold-start stampedes, a background refresh racing a
+        cold caller) share one fetch and its result or error.
+        """
+        return self.flight.do('snapshot', lambda: self._refresh(loader))
+
+    def _refresh(self, loader: "SnapshotLoader") -> Optional[pd.DataFrame]:
+        """Run the loader once; it receives the current frame and sync state to update incrementally"""
+        if self.shared is not None:
+            return self._refresh_shared(loader)
+        return self._load(loader)
+
+    def _load(self, loader: "SnapshotLoader") -> Optional[pd.DataFrame]:
+        """Fetch through the loader and install the result"""
+        with self._lock:
+            previous_df, previous_state = self._df, self._sync_state
+        df, sync_state = loader(previous_df, previous_state)
+        if df is not None:
+            self._install(df, sync_state, previous_df)
+            if self.disk is not None and df is not previous_df:
+                self.disk.save(df, self._fetched_at, sync_state)
+        return df
+
+    def _install(self, df: pd.DataFrame, sync_state: Optional[Dict[str, Any]],
+                 previous_df: Optional[pd.DataFrame], fetched_at: Optional[datetime.datetime] = None):
+        """Warm the derived values of a new frame, then swap it in"""
+        derived = None
+        if df is not previous_df and self.warmers:
+            # Build indexes before the swap so readers never see a bare snapshot;
+            # each warmer sees the values warmed before it, in declaration order
+            with get_perf_monitor().stage('warm', rows=len(df)):
+                derived = {}
+                for name, builder in self.warmers.items():
+                    derived[name] = builder(df, derived)
+        self.store(df, fetched_at=fetched_at, sync_state=sync_state, derived=derived)
+
+    def _refresh_shared(self, loader: "SnapshotLoader") -> Optional[pd.DataFrame]:
+        """Adopt the shared snapshot, fetching from the source only as the elected refresher.
+
+        A worker that loses the election keeps serving what it has; a cold worker waits
+        for the refresher to publish and fetches for itself only if nothing arrives.
+        """
+        shared = self.shared
+        monitor = get_perf_monitor()
+        meta = shared.current()
+        if meta is not None and self._adopt(meta) and shared.is_fresh(meta):
+            monitor.annotate(shared='adopted')
+            return self._df
+
+        token = shared.acquire_lease()
+        if token is None:
+            monitor.annotate(shared='follower')
+            if self._df is None:
+                meta = shared.wait_for_publish(meta['version'] if meta is not None else None)
+                if meta is None or not self._adopt(meta):
+                    return self._load(loader)
+            return self._df
+
+        monitor.annotate(shared='leader')
+        try:
+            with self._lock:
+                previous_df = self._df
+            df = self._load(loader)
+            if df is not None:
+                self.shared_version = shared.publish(
+                    df, self._fetched_at, self._sync_state, changed=df is not previous_df
+                )
+            return df
+        finally:
+            shared.release_lease(token)
+
+    def store(self, df: pd.DataFrame, fetched_at: Optional[datetime.datetime] = None,
+              sync_state: Optional[Dict[str, Any]] = None, derived: Optional[Dict[str, Any]] = None):
+        """Atomically replace the cached snapshot and its prebuilt derived values.
+
+        An unchanged frame keeps its version and derived values.
+        """
+        with self._lock:
+            if df is not self._df:
+                self.version += 1
+                self._derived = dict(derived or {})
+            self._df = df
+            self._sync_state = sync_state
+            self._fetched_at = fetched_at or datetime.datetime.now()
+            self.last_error = None
+
+    def version_of(self, df: pd.DataFrame) -> Optional[int]:
+        """Version of df if it is the current snapshot, otherwise None"""
+        with self._lock:
+            return self.version if df is self._df else None
+
+    def derived(self, name: str, df: pd.DataFrame, builder: Callable[[pd.DataFrame], Any]) -> Any:
+        """Return a value derived from the snapshot, built once per snapshot version.
+
+        Frames other than the current snapshot are built without caching.
+        """
+        with self._lock:
+            is_current = df is self._df
+            if is_current and name in self._derived:
+                return self._derived[name]
+
+        value = builder(df)
+        if is_current:
+            with self._lock:
+                if df is self._df:
+                    self._derived.setdefault(name, value)
+        return value
+
+    def _restore_from_disk(self):
+        """Adopt the on-disk snapshot and flag it for a background reconcile (lock held)"""
+        restored = self.disk.load()
+        if restored is None:
+            return
+        df, fetched_at, sync_state = restored
+        self._df = df
+        self._fetched_at = fetched_at
+        self._sync_state = sync_state
+        self._needs_reconcile = True
+        self._derived = {}
+        self.version += 1
+
+    def _adopt(self, meta: Dict[str, Any]) -> bool:
+        """Install the published snapshot unless it is already current; True when serving it"""
+        if meta['version'] != self.shared_version:
+            adopted = self.shared.load(meta['version'])
+            if adopted is None:
+                return False
+            self._install(adopted, meta['sync_state'], self._df, fetched_at=meta['fetched_at'])
+            self.shared_version = meta['version']
+        elif self._df is not None:
+            # Same frame republished by the refresher: only its fetch time moved
+            self.store(self._df, fetched_at=meta['fetched_at'], sync_state=meta['sync_state'])
+        return self._df is not None
+
+    def _background_refresh(self, loader: "SnapshotLoader"):
+        """Refresh in a worker thread, keeping the stale snapshot on failure"""
+        try:
+            with get_perf_monitor().stage('background_refresh'):
+                self.refresh(loader)
+        except Exception as e:
+            self.last_error = str(e)
+            print(f"❌ Background snapshot refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+# (previous_df, previous_sync_state) -> (df, sync_state)
+SnapshotLoader = Callable[
+    [Optional[pd.DataFrame], Optional[Dict[str, Any]]],
+    Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]
+]
+
+@st.cache_resource
+def get_snapshot_cache() -> SnapshotCache:
+    """Return the snapshot cache shared by every session in this process"""
+    disk = DiskSnapshot(Config.SNAPSHOT_PATH) if Config.SNAPSHOT_PATH else None
+    return SnapshotCache(
+        Config.DATA_CACHE_TTL, disk=disk,
+        warmers={
+            'stats_index': lambda df, derived: AnalyticsEngine.build_stats_index(df),
+            'rolling_metrics': lambda df, derived: AnalyticsEngine.build_rolling_metrics(
+                df, derived['stats_index']
+            ),
+        },
+        shared=create_shared_store()
+    )
+
+class BackgroundRefresher:
+    """Worker thread that refreshes the snapshot on a jittered schedule.
+
+    Refreshes go through SnapshotCache.refresh, so they coalesce with any foreground
+    load and swap in the new frame together with its warmed indexes. The worker belongs
+    to no session; failures are reported through health() only.
+    """
+
+    def __init__(self, cache: SnapshotCache, loader: "SnapshotLoader",
+                 interval_seconds: float, jitter_seconds: float = 0.0):
+        self.cache = cache
+        self.loader = loader
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self.runs = 0
+        self.failures = 0
+        self.last_success_at: Optional[datetime.datetime] = None
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[datetime.datetime] = None
+        self.last_duration_s: Optional[float] = None
+        self.next_run_at: Optional[datetime.datetime] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._random = random.Random()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "BackgroundRefresher":
+        """Start the worker; the first refresh runs immediately"""
+        if not self.alive:
+            self._stop.clear()
+            self._thread = start_worker_thread(self._run, "snapshot-refresher")
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Ask the worker to exit and wait for an in-flight refresh to finish"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def refresh_once(self) -> bool:
+        """Run one refresh and record its outcome; True on success"""
+        started = time.perf_counter()
+        self.runs += 1
+        try:
+            with get_perf_monitor().stage('scheduled_refresh'):
+                self.cache.refresh(self.loader)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            self.last_error_at = datetime.datetime.now()
+            print(f"❌ Scheduled snapshot refresh failed: {e}")
+            return False
+        finally:
+            self.last_duration_s = time.perf_counter() - started
+        self.last_success_at = datetime.datetime.now()
+        return True
+
+    def health(self) -> Dict[str, Any]:
+        """Health metrics for the debug panel"""
+        return {
+            'alive': self.alive,
+            'interval_seconds': self.interval_seconds,
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_success_at': self.last_success_at,
+            'last_error': self.last_error,
+            'last_error_at': self.last_error_at,
+            'last_duration_s': self.last_duration_s,
+            'next_run_at': self.next_run_at,
+        }
+
+    def _next_delay(self) -> float:
+        jitter = self._random.uniform(-self.jitter_seconds, self.jitter_seconds)
+        return max(1.0, self.interval_seconds + jitter)
+
+    def _run(self):
+        delay = 0.0
+        while not self._stop.wait(delay):
+            self.refresh_once()
+            delay = self._next_delay()
+            self.next_run_at = datetime.datetime.now() + datetime.timedelta(seconds=delay)
+        print("🛑 Snapshot refresher stopped")
+
+@st.cache_resource
+def get_background_refresher() -> Optional[BackgroundRefresher]:
+    """Start the process-wide refresher once when Config.BACKGROUND_REFRESH is on"""
+    if not Config.BACKGROUND_REFRESH:
+        return None
+    refresher = BackgroundRefresher(
+        get_snapshot_cache(), DataManager(get_data_source()).load_snapshot,
+        Config.REFRESH_INTERVAL_SECONDS, Config.REFRESH_JITTER_SECONDS
+    )
+    atexit.register(refresher.stop)
+    print(f"🔁 Background refresher every {Config.REFRESH_INTERVAL_SECONDS:.0f}s")
+    return refresher.start()
 
 # ==================== DATA MANAGER ====================
 class DataManager:
     """Handles all data operations including Google Sheets connection"""
     
-    def __init__(self):
-        self._sheet = None
+    def __init__(self, source: Optional[DataSource] = None):
+        self._source = source
+    
+    @property
+    def source(self) -> DataSource:
+        """The data source rows are read from (Config.DATA_SOURCE unless one was passed in)"""
+        return self._source if self._source is not None else get_data_source()
     
     @st.cache_resource
     def connect_to_gsheet(_self):
         """Establish connection to Google Sheets"""
         try:
+            gspread = import_module_timed("gspread")
+            service_account = import_module_timed("google.oauth2.service_account")
             credentials_info = _self._get_credentials()
-            credentials = Credentials.from_service_account_info(
+            credentials = service_account.Credentials.from_service_account_info(
                 credentials_info,
                 scopes=[
                     "https://www.googleapis.com/auth/spreadsheets",
@@ -455,7 +1986,9 @@ class DataManager:
             sheet = client.open_by_key(Config.SPREADSHEET_ID).worksheet(Config.SHEET_NAME)
             return sheet
         except Exception as e:
-            st.error(f"Google Sheets connection error: {str(e)}")
+            # Worker threads have no session to show it in; the refresher records the error
+            if get_script_run_ctx() is not None:
+                st.error(f"Google Sheets connection error: {str(e)}")
             raise e
     
     def _get_credentials(self) -> Dict[str, Any]:
@@ -546,32 +2079,253 @@ class DataManager:
         """)
     
     def get_sheet_data(self) -> Optional[pd.DataFrame]:
-        """Get all data from Google Sheets and convert to DataFrame"""
+        """Get the cleaned DataFrame from the shared snapshot cache"""
         try:
-            sheet = self.connect_to_gsheet()
-            all_values = sheet.get_all_values()
-            
-            if not all_values or len(all_values) < 2:
-                return None
-            
-            header_row = all_values[0]
-            data_rows = all_values[1:]
-            
-            # Find last row with data
-            last_index = self._find_last_data_row(data_rows)
-            valid_data_rows = data_rows[:last_index + 1] if data_rows else []
-            
-            if not valid_data_rows:
-                return None
-            
-            df = pd.DataFrame(valid_data_rows, columns=header_row)
-            df = self._clean_dataframe(df)
-            
-            return df if not df.empty else None
-            
+            with get_perf_monitor().stage('get_sheet_data'):
+                # Resolve the source here: a stale snapshot is refreshed in a worker thread,
+                # where cache_resource cannot return the shared source
+                return get_snapshot_cache().get(DataManager(self.source).load_snapshot)
         except Exception as e:
             st.error(f"Error fetching data: {str(e)}")
             return None
+
+    def snapshot_info(self) -> Dict[str, Any]:
+        """Describe the cached snapshot for display (fetch time, age, refresh state)"""
+        cache = get_snapshot_cache()
+        refresher = get_background_refresher()
+        # Duck-typed: the source is a cached instance of the class from the first run,
+        # and every rerun re-executes this script and defines a new ResilientSource
+        upstream_stats = getattr(self.source, 'stats', None)
+        return {
+            'fetched_at': cache.fetched_at,
+            'age_seconds': cache.age_seconds(),
+            'refreshing': cache.refreshing,
+            'version': cache.version,
+            'memory_bytes': cache.memory_bytes(),
+            'fetches': cache.flight.stats(),
+            'upstream': upstream_stats() if callable(upstream_stats) else None,
+            'last_error': cache.last_error,
+            'refresher': refresher.health() if refresher is not None else None,
+            'shared': (
+                {**cache.shared.stats(), 'version': cache.shared_version}
+                if cache.shared is not None else None
+            ),
+        }
+
+    def get_derived(self, name: str, df: pd.DataFrame, builder: Callable[[pd.DataFrame], Any]) -> Any:
+        """Get an index or aggregate derived from the snapshot, built once per snapshot"""
+        return get_snapshot_cache().derived(name, df, builder)
+
+    def snapshot_version(self, df: pd.DataFrame) -> Optional[int]:
+        """Version of the cached snapshot df came from, None for any other frame"""
+        return get_snapshot_cache().version_of(df)
+
+    def load_snapshot(self, previous_df: Optional[pd.DataFrame] = None,
+                      sync_state: Optional[Dict[str, Any]] = None
+                      ) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """Load the cleaned DataFrame from the sheet, bypassing the cache.
+
+        With incremental sync and a previous snapshot, only rows appended since the last
+        sync are fetched; any mismatch in the re-read overlap falls back to a full load.
+        """
+        monitor = get_perf_monitor()
+        sheet = self.source
+        with monitor.stage('auth', source=sheet.name):
+            sheet.connect()
+
+        can_sync_incrementally = (
+            Config.SHEET_SYNC_MODE == 'incremental'
+            and previous_df is not None and sync_state is not None
+            and sync_state.get('syncs_since_full', 0) < Config.SHEET_FULL_SYNC_EVERY
+        )
+        if can_sync_incrementally:
+            result = self._sync_incremental(sheet, previous_df, sync_state)
+            if result is not None:
+                return result
+            print("🔄 Sheet changed above the sync point, running a full reload")
+            # The layout may have changed too, so resolve the columns again
+            sync_state = None
+
+        return self._sync_full(sheet, sync_state)
+
+    def fetch_sheet_data(self) -> Optional[pd.DataFrame]:
+        """Get all data from the data source and convert to DataFrame, bypassing the cache"""
+        df, _ = self._sync_full(self.source)
+        return df
+
+    def _sync_full(self, sheet: DataSource, sync_state: Optional[Dict[str, Any]] = None
+                   ) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """Download the mapped columns of the sheet and record where the next incremental sync starts.
+
+        Only the mapped columns are requested, and the values API trims trailing empty
+        rows. The columns recorded by the previous sync are read from row 1 in a single
+        request, checked against their header cells; without them, or if those cells
+        changed, the header row is read first to resolve the columns.
+        """
+        monitor = get_perf_monitor()
+        with monitor.stage('fetch', mode='full') as record:
+            header_row, columns, data_rows = self._fetch_known_columns(sheet, sync_state)
+            if columns is None:
+                header_values, = sheet.batch_get(["1:1"])
+                header_row = list(header_values[0]) if header_values else []
+                columns = self._projected_columns(header_row)
+                if not columns:
+                    return None, None
+                data_rows = self._fetch_columns(sheet, columns, 2)
+            record.update(rows=len(data_rows), columns=len(columns), header_width=len(header_row))
+
+        if not data_rows:
+            return None, None
+
+        # Find last row with data
+        last_index = self._find_last_data_row(data_rows)
+        valid_data_rows = data_rows[:last_index + 1]
+        if not any(valid_data_rows[-1]):
+            return None, None
+
+        projected_header = [header_row[i] for i in columns]
+        with monitor.stage('clean', rows=len(valid_data_rows)):
+            df = self._clean_dataframe(pd.DataFrame(valid_data_rows, columns=projected_header))
+
+        if df.empty:
+            return None, None
+        return df, self._build_sync_state(header_row, columns, valid_data_rows, len(valid_data_rows), 0)
+
+    def _sync_incremental(self, sheet: DataSource, previous_df: pd.DataFrame, sync_state: Dict[str, Any]
+                          ) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Fetch only the tail of the mapped columns and merge new rows into the previous frame.
+
+        Returns None when the header or the overlapping tail rows no longer match.
+        """
+        header_row = sync_state['header']
+        columns = sync_state.get('columns')
+        if not columns:
+            # Sync state written before column projection
+            return None
+        tail_rows = sync_state['tail']
+        row_count = sync_state['row_count']
+
+        # Sheet rows are 1-based and row 1 is the header
+        start_row = row_count - len(tail_rows) + 2
+        monitor = get_perf_monitor()
+        with monitor.stage('fetch', mode='incremental') as record:
+            header_values, *column_values = sheet.batch_get(
+                ["1:1"] + self._column_ranges(columns, start_row)
+            )
+            fetched_rows = self._join_column_ranges(columns, column_values)
+            record.update(rows=len(fetched_rows), columns=len(columns))
+
+        current_header = self._pad_row(header_values[0] if header_values else [], len(header_row))
+        if current_header != header_row or self._projected_columns(current_header) != columns:
+            return None
+
+        if fetched_rows[:len(tail_rows)] != tail_rows:
+            return None
+
+        appended_rows = fetched_rows[len(tail_rows):]
+        if appended_rows:
+            last_index = self._find_last_data_row(appended_rows)
+            if not any(appended_rows[last_index]):
+                appended_rows = []
+            else:
+                appended_rows = appended_rows[:last_index + 1]
+
+        syncs_since_full = sync_state.get('syncs_since_full', 0) + 1
+        if not appended_rows:
+            return previous_df, dict(sync_state, syncs_since_full=syncs_since_full)
+
+        projected_header = [header_row[i] for i in columns]
+        with monitor.stage('clean', rows=len(appended_rows)):
+            new_df = self._clean_dataframe(pd.DataFrame(appended_rows, columns=projected_header))
+        df = pd.concat([previous_df, new_df], ignore_index=True)
+        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
+            df = df.sort_values('Date_parsed', kind='stable', ignore_index=True)
+
+        all_tail = tail_rows + appended_rows
+        return df, self._build_sync_state(
+            header_row, columns, all_tail, row_count + len(appended_rows), syncs_since_full
+        )
+
+    def _build_sync_state(self, header_row: list, columns: List[int], rows: list, row_count: int,
+                          syncs_since_full: int) -> Dict[str, Any]:
+        """Remember the header, projected columns, row count and last rows to verify on the next sync"""
+        overlap = max(1, Config.SHEET_SYNC_OVERLAP_ROWS)
+        return {
+            'header': list(header_row),
+            'columns': list(columns),
+            'row_count': row_count,
+            'tail': [self._pad_row(row, len(columns)) for row in rows[-overlap:]],
+            'syncs_since_full': syncs_since_full,
+        }
+
+    def _projected_columns(self, header_row: list) -> List[int]:
+        """0-based sheet columns to download: the mapped ones, or the first six if none map"""
+        mapping = self.resolve_columns(header_row)
+        if mapping:
+            return sorted(mapping.values())
+        return list(range(min(6, len(header_row))))
+
+    def _fetch_known_columns(self, sheet: DataSource, sync_state: Optional[Dict[str, Any]]
+                             ) -> Tuple[list, Optional[List[int]], List[list]]:
+        """Fetch the previously projected columns with their header cells in one request.
+
+        Returns (header, columns, data rows), or None columns when there is no previous
+        projection or its header cells no longer match.
+        """
+        columns = sync_state.get('columns') if sync_state else None
+        if not columns:
+            return [], None, []
+        header_row = sync_state['header']
+        rows = self._fetch_columns(sheet, columns, 1)
+        if not rows or rows[0] != [header_row[i] for i in columns]:
+            return [], None, []
+        return header_row, columns, rows[1:]
+
+    def _fetch_columns(self, sheet: DataSource, columns: List[int], start_row: int) -> List[list]:
+        """Fetch the given columns from start_row down, one range per contiguous run"""
+        return self._join_column_ranges(columns, sheet.batch_get(self._column_ranges(columns, start_row)))
+
+    @staticmethod
+    def _column_ranges(columns: List[int], start_row: int) -> List[str]:
+        """Open-ended A1 ranges covering the columns, merging adjacent ones (e.g. A2:A, C2:F)"""
+        ranges = []
+        run_start = previous = columns[0]
+        for col in columns[1:] + [None]:
+            if col is not None and col == previous + 1:
+                previous = col
+                continue
+            ranges.append(f"{column_letter(run_start + 1)}{start_row}:{column_letter(previous + 1)}")
+            if col is not None:
+                run_start = previous = col
+        return ranges
+
+    def _join_column_ranges(self, columns: List[int], range_values: List[List[list]]) -> List[list]:
+        """Stitch per-range values back into rows of the projected columns.
+
+        Each range is trimmed independently by the values API, so the data extent is
+        the longest range; shorter ranges and rows are padded with empty strings.
+        """
+        widths = []
+        previous = None
+        for col in columns:
+            if previous is not None and col == previous + 1:
+                widths[-1] += 1
+            else:
+                widths.append(1)
+            previous = col
+
+        n_rows = max((len(values) for values in range_values), default=0)
+        rows = [[] for _ in range(n_rows)]
+        for width, values in zip(widths, range_values):
+            for i in range(n_rows):
+                rows[i].extend(self._pad_row(values[i] if i < len(values) else [], width))
+        return rows
+
+    @staticmethod
+    def _pad_row(row: list, width: int) -> list:
+        """Pad or trim a row to the header width, as get_all_values does"""
+        row = list(row[:width])
+        return row + [''] * (width - len(row))
     
     def _find_last_data_row(self, data_rows: list) -> int:
         """Find the last row containing data"""
@@ -581,7 +2335,17 @@ class DataManager:
                 last_index = i
         return last_index
     
-    def _clean_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    # Columns and dtypes kept in the cached snapshot; display strings are derived on demand
+    COMPACT_SCHEMA = {
+        'Date_parsed': 'datetime64[ns]',
+        'Total_Signal': np.int32,
+        'Finished': np.int32,
+        'TP': np.int32,
+        'SL': np.int32,
+        'Winrate_num': np.float32,
+    }
+    
+    def _clean_dataframe(self, df: pd.DataFrame, compact: bool = True) -> pd.DataFrame:
         """Clean and process the DataFrame"""
         # Remove empty rows
         df = df[df.iloc[:, :6].any(axis=1)]
@@ -601,30 +2365,73 @@ class DataManager:
         
         # Sort by date if available
         if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
-            df['Date_parsed'] = pd.to_datetime(df['Date_parsed'], errors='coerce')
             df = df.sort_values('Date_parsed')
         
+        if compact:
+            df = self._compact_dataframe(df)
+        
         return df
     
+    def _compact_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Keep only COMPACT_SCHEMA columns, downcast, and drop the row labels"""
+        columns = {}
+        for col, dtype in self.COMPACT_SCHEMA.items():
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy()
+            if dtype is np.int32:
+                info = np.iinfo(np.int32)
+                values = np.clip(values, info.min, info.max)
+            columns[col] = values.astype(dtype)
+        return pd.DataFrame(columns)
+    
+    @staticmethod
+    def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> Dict[str, Any]:
+        """Deep memory footprint per column of two layouts of the same rows"""
+        before_usage = before.memory_usage(deep=True)
+        after_usage = after.memory_usage(deep=True)
+        columns = {}
+        for col in before_usage.index.union(after_usage.index, sort=False):
+            columns[str(col)] = {
+                'before_bytes': int(before_usage.get(col, 0)),
+                'after_bytes': int(after_usage.get(col, 0)),
+            }
+        total_before, total_after = int(before_usage.sum()), int(after_usage.sum())
+        return {
+            'rows': len(after),
+            'before_bytes': total_before,
+            'after_bytes': total_after,
+            'saved_pct': round(100 * (1 - total_after / total_before), 1) if total_before else 0.0,
+            'columns': columns,
+        }
+    
     def _map_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Map column names to standard format"""
-        column_mapping = {}
-        for col in df.columns:
-            col_lower = col.lower().strip()
+        mapping = self.resolve_columns(list(df.columns))
+        return df.rename(columns={df.columns[i]: standard for standard, i in mapping.items()})
+    
+    @staticmethod
+    def resolve_columns(header_row: list) -> Dict[str, int]:
+        """Resolve standard column names to 0-based header positions; the first match wins"""
+        mapping = {}
+        for i, col in enumerate(header_row):
+            col_lower = str(col).lower().strip()
             if any(keyword in col_lower for keyword in ['date', 'tanggal', 'tgl']):
-                column_mapping['Date'] = col
+                standard = 'Date'
             elif any(keyword in col_lower for keyword in ['total', 'signal']):
-                column_mapping['Total_Signal'] = col
+                standard = 'Total_Signal'
             elif 'finish' in col_lower:
-                column_mapping['Finished'] = col
+                standard = 'Finished'
             elif col_lower == 'tp':
-                column_mapping['TP'] = col
+                standard = 'TP'
             elif col_lower == 'sl':
-                column_mapping['SL'] = col
+                standard = 'SL'
             elif any(keyword in col_lower for keyword in ['winrate', 'win_rate', 'win rate']):
-                column_mapping['Winrate_pct'] = col
-        
-        return df.rename(columns=column_mapping)
+                standard = 'Winrate_pct'
+            else:
+                continue
+            mapping.setdefault(standard, i)
+        return mapping
     
     def _process_numeric_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """Process numeric columns"""
@@ -642,103 +2449,473 @@ class DataManager:
             df['Winrate_num'] = pd.to_numeric(df['Winrate_num'], errors='coerce').fillna(0)
         return df
     
-    def _process_dates(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Process date column"""
-        if 'Date' not in df.columns:
-            return df
+    def _process_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Process date column with whole-column parsing of the unique date strings"""
+        if 'Date' not in df.columns:
+            return df
+        
+        raw_dates = df['Date'].astype(str)
+        stripped = raw_dates.str.strip()
+        has_value = df['Date'].notna().to_numpy() & (stripped != '').to_numpy()
+        
+        # Each distinct string is parsed once, then mapped back onto every row
+        parsed_lookup = self._parse_date_strings(pd.Series(stripped[has_value].unique(), dtype=object))
+        parsed = stripped.map(parsed_lookup).to_numpy(dtype='datetime64[ns]')
+        
+        # Unparseable dates fall back to counting back one day per row from today
+        fallback = has_value & pd.isna(parsed)
+        if fallback.any():
+            total_rows = len(df)
+            days_back = total_rows - np.flatnonzero(fallback) - 1
+            # Beyond ~270 years the offset no longer fits datetime64[ns]; leave those undated
+            in_range = days_back < 100_000
+            base_dates = pd.Timestamp(datetime.datetime.now()) - pd.to_timedelta(days_back[in_range], unit='D')
+            parsed[np.flatnonzero(fallback)[in_range]] = base_dates.to_numpy()
+        
+        df['Date_parsed'] = pd.Series(parsed, index=df.index)
+        
+        return df
+    
+    def _parse_date_strings(self, values: pd.Series) -> pd.Series:
+        """Parse unique, stripped date strings into a Series of Timestamps indexed by the string"""
+        result = pd.Series(pd.NaT, index=values.to_numpy(), dtype='datetime64[ns]')
+        if values.empty:
+            return result
+        
+        # Handle date ranges (keep the end date, in the current year)
+        range_parts = values.str.extract(r'(\d{2})/(\d{2})-(\d{2})/(\d{2})')
+        current_year = pd.Series(datetime.datetime.now().year, index=values.index)
+        candidates = [self._assemble_dates(current_year, range_parts[2], range_parts[3])]
+        
+        # Handle standard date formats, first matching pattern wins
+        ymd = values.str.extract(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+        candidates.append(self._assemble_dates(ymd[0], ymd[1], ymd[2]))
+        for pattern in [r'(\d{1,2})/(\d{1,2})/(\d{4})', r'(\d{1,2})-(\d{1,2})-(\d{4})']:
+            mdy = values.str.extract(pattern)
+            candidates.append(self._assemble_dates(mdy[2], mdy[0], mdy[1]))
+        
+        parsed = candidates[0]
+        for candidate in candidates[1:]:
+            parsed = parsed.fillna(candidate)
+        
+        # Try pandas parsing on whatever the patterns could not resolve
+        unresolved = parsed.isna()
+        if unresolved.any():
+            parsed[unresolved] = values[unresolved].map(self._parse_freeform_date).astype('datetime64[ns]')
+        
+        result[:] = parsed.to_numpy()
+        return result
+    
+    @staticmethod
+    def _assemble_dates(year: pd.Series, month: pd.Series, day: pd.Series) -> pd.Series:
+        """Build dates from extracted year/month/day parts; invalid combinations become NaT"""
+        parts = pd.DataFrame({
+            'year': pd.to_numeric(year, errors='coerce'),
+            'month': pd.to_numeric(month, errors='coerce'),
+            'day': pd.to_numeric(day, errors='coerce'),
+        })
+        return pd.to_datetime(parts, errors='coerce')
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _parse_freeform_date(date_str: str) -> Optional[pd.Timestamp]:
+        """Parse a free-form date string with pandas, memoized across snapshots"""
+        try:
+            parsed_date = pd.to_datetime(date_str, errors='coerce')
+        except Exception:
+            return pd.NaT
+        if pd.isna(parsed_date):
+            return pd.NaT
+        return parsed_date.tz_localize(None) if parsed_date.tzinfo is not None else parsed_date
+
+# ==================== ANALYTICS ENGINE ====================
+class StatsIndex:
+    """Sorted dates plus prefix sums of TP/SL/Total_Signal for constant-time window statistics"""
+    
+    PERIOD_DAYS = {'week': 7, 'month': 30}
+    
+    def __init__(self, df: pd.DataFrame):
+        self.row_count = len(df)
+        self.has_tpsl = 'TP' in df.columns and 'SL' in df.columns
+        self.has_total_signal = 'Total_Signal' in df.columns
+        
+        # Row order of the index: by date with undated rows last, as _clean_dataframe sorts
+        self.order: Optional[np.ndarray] = None
+        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
+            dates = df['Date_parsed'].to_numpy(dtype='datetime64[ns]')
+            undated = pd.isna(dates)
+            undated_last = not undated.any() or undated[undated.argmax():].all()
+            if not (undated_last and df['Date_parsed'].dropna().is_monotonic_increasing):
+                self.order = np.argsort(dates, kind='stable')
+                dates = dates[self.order]
+            self.dated_count = int((~pd.isna(dates)).sum())
+            self.dates = dates[:self.dated_count]
+        else:
+            self.dated_count = 0
+            self.dates = np.array([], dtype='datetime64[ns]')
+        
+        self.cum_tp = self._prefix_sum(df, 'TP')
+        self.cum_sl = self._prefix_sum(df, 'SL')
+        self.cum_signals = self._prefix_sum(df, 'Total_Signal')
+    
+    def _prefix_sum(self, df: pd.DataFrame, column: str) -> np.ndarray:
+        """Cumulative sum with a leading zero, in index order"""
+        if column not in df.columns:
+            return np.zeros(self.row_count + 1, dtype=np.int64)
+        values = pd.to_numeric(df[column], errors='coerce').fillna(0).to_numpy(dtype=np.int64)
+        if self.order is not None:
+            values = values[self.order]
+        return np.concatenate(([0], np.cumsum(values)))
+    
+    @property
+    def has_dates(self) -> bool:
+        """Whether any row has a parsed date"""
+        return self.dated_count > 0
+    
+    def period_positions(self, period: str, now: Optional[datetime.datetime] = None) -> Tuple[int, int]:
+        """Row positions [start, stop) selected by filter_data_by_period for a period"""
+        days = self.PERIOD_DAYS.get(period)
+        if days is None:
+            return 0, self.row_count
+        
+        fallback = (max(0, self.row_count - days), self.row_count)
+        if not self.has_dates:
+            return fallback
+        
+        start, stop = self.trailing_positions(days, now)
+        return (start, stop) if start < stop else fallback
+    
+    def trailing_positions(self, days: float, now: Optional[datetime.datetime] = None) -> Tuple[int, int]:
+        """Row positions [start, stop) of dated rows from the last `days` days, possibly empty"""
+        start_date = (now or datetime.datetime.now()) - datetime.timedelta(days=days)
+        start = int(np.searchsorted(self.dates, np.datetime64(start_date, 'ns'), side='left'))
+        return start, self.dated_count
+    
+    def date_positions(self, start_date=None, end_date=None) -> Tuple[int, int]:
+        """Row positions [start, stop) of dated rows with start_date <= date <= end_date.
+
+        A plain date as end_date includes that whole day.
+        """
+        start = 0
+        stop = self.dated_count
+        if start_date is not None:
+            start = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date), 'ns'), side='left'))
+        if end_date is not None:
+            end = pd.Timestamp(end_date)
+            if not isinstance(end_date, datetime.datetime):
+                end += pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+            stop = int(np.searchsorted(self.dates, np.datetime64(end, 'ns'), side='right'))
+        return start, max(start, stop)
+    
+    def statistics(self, start: int, stop: int) -> Optional[Dict[str, Any]]:
+        """Statistics for rows [start, stop), matching AnalyticsEngine.calculate_statistics"""
+        if stop <= start or not self.has_tpsl:
+            return None
+        
+        total_tp = int(self.cum_tp[stop] - self.cum_tp[start])
+        total_sl = int(self.cum_sl[stop] - self.cum_sl[start])
+        finished_total = total_tp + total_sl
+        stats = {
+            'total_tp': total_tp,
+            'total_sl': total_sl,
+            'overall_winrate': 100 * total_tp / finished_total if finished_total > 0 else 0,
+        }
+        
+        if self.has_total_signal:
+            total_signals = int(self.cum_signals[stop] - self.cum_signals[start])
+            stats['total_signals'] = total_signals
+            stats['completion_rate'] = 100 * finished_total / total_signals if total_signals > 0 else 0
+        else:
+            stats['total_signals'] = finished_total
+            stats['completion_rate'] = 100
+        
+        return stats
+    
+    def take(self, df: pd.DataFrame, start: int, stop: int) -> pd.DataFrame:
+        """Rows [start, stop) of the frame the index was built from.
+
+        For a date-sorted snapshot this is a positional slice that shares its memory.
+        """
+        if self.order is None:
+            return df.iloc[start:stop]
+        return df.iloc[self.order[start:stop]]
+
+class RollingMetrics:
+    """Rolling winrates, win/loss runs and TP-SL equity for a snapshot, in StatsIndex row order.
+
+    The per-row arrays are built once per snapshot; any window [start, stop) is then
+    summarised with O(window) NumPy operations on slices of them.
+    """
+    
+    WINDOWS = (7, 30, 90)
+    
+    def __init__(self, index: StatsIndex):
+        self.index = index
+        n = index.row_count
+        tp = np.diff(index.cum_tp)
+        sl = np.diff(index.cum_sl)
+        
+        # TP+SL weighted winrate over (date - N days, date] for every dated row
+        dates = index.dates
+        ends = np.arange(1, len(dates) + 1)
+        self.winrates: Dict[int, np.ndarray] = {}
+        for days in self.WINDOWS:
+            starts = np.searchsorted(dates, dates - np.timedelta64(days, 'D'), side='right')
+            window_tp = index.cum_tp[ends] - index.cum_tp[starts]
+            window_total = window_tp + index.cum_sl[ends] - index.cum_sl[starts]
+            rates = np.full(n, np.nan)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rates[:len(dates)] = np.where(window_total > 0, 100 * window_tp / window_total, np.nan)
+            self.winrates[days] = rates
+        
+        # +1 win (TP > SL), -1 loss, 0 flat; run_length is the length of the run ending at each row
+        self.outcome = np.sign(tp - sl).astype(np.int8)
+        run_starts = np.ones(n, dtype=bool)
+        run_starts[1:] = self.outcome[1:] != self.outcome[:-1]
+        start_positions = np.flatnonzero(run_starts)
+        self.run_length = np.arange(n) - start_positions[np.cumsum(run_starts) - 1] + 1
+        
+        # Cumulative TP - SL with a leading zero
+        self.equity = np.concatenate(([0], np.cumsum(tp - sl)))
+    
+    def drawdown(self, start: int, stop: int) -> np.ndarray:
+        """Distance of cumulative TP-SL below its running peak, measured from the window start"""
+        equity = self.equity[start + 1:stop + 1] - self.equity[start]
+        peak = np.maximum.accumulate(np.maximum(equity, 0))
+        return peak - equity
+    
+    def summary(self, start: int, stop: int) -> Optional[Dict[str, Any]]:
+        """Streaks, drawdown and latest rolling winrates for rows [start, stop)"""
+        if stop <= start:
+            return None
+        
+        outcome = self.outcome[start:stop]
+        # Runs that began before the window are clipped to its start
+        runs = np.minimum(self.run_length[start:stop], np.arange(1, stop - start + 1))
+        wins = runs[outcome == 1]
+        losses = runs[outcome == -1]
+        drawdown = self.drawdown(start, stop)
+        trough = int(drawdown.argmax())
+        
+        # Latest dated row in the window carries the rolling values
+        last_dated = min(stop, self.index.dated_count) - 1
+        rolling = {}
+        for days in self.WINDOWS:
+            value = self.winrates[days][last_dated] if last_dated >= start else np.nan
+            rolling[days] = None if np.isnan(value) else float(value)
+        
+        return {
+            'current_streak': int(runs[-1]) if outcome[-1] != 0 else 0,
+            'current_streak_type': {1: 'win', -1: 'loss'}.get(int(outcome[-1]), 'flat'),
+            'longest_win_streak': int(wins.max()) if len(wins) else 0,
+            'longest_losing_streak': int(losses.max()) if len(losses) else 0,
+            'max_drawdown': int(drawdown[trough]),
+            'max_drawdown_offset': trough,
+            'current_drawdown': int(drawdown[-1]),
+            'net_tp_sl': int(self.equity[stop] - self.equity[start]),
+            'rolling_winrate': rolling,
+        }
+    
+    def frame(self, df: pd.DataFrame, start: int, stop: int) -> pd.DataFrame:
+        """Per-row rolling winrates and drawdown for rows [start, stop), for charting"""
+        columns = {'Date_parsed': self.index.take(df, start, stop)['Date_parsed'].to_numpy()}
+        for days in self.WINDOWS:
+            columns[f'Winrate_{days}d'] = self.winrates[days][start:stop]
+        columns['Drawdown'] = self.drawdown(start, stop)
+        return pd.DataFrame(columns)
+
+class RecordsTable:
+    """Sorted, searchable and paginated views of a snapshot's records, in StatsIndex row order.
+
+    Sort orders and search text are built lazily once per snapshot. A view (window, sort,
+    search) is resolved to row positions once, and each page of it is formatted once;
+    both are kept in small LRU caches so paging through history only ships one page.
+    """
+    
+    COLUMNS = {
+        'Date_parsed': '📅 Date',
+        'Total_Signal': '📊 Total Signal',
+        'Finished': '✅ Finished',
+        'TP': '🎯 TP',
+        'SL': '🛑 SL',
+        'Winrate_num': '📈 Winrate',
+    }
+    
+    def __init__(self, df: pd.DataFrame, index: StatsIndex, max_views: int, max_pages: int):
+        self.df = df
+        self.index = index
+        self.columns = [column for column in self.COLUMNS if column in df.columns]
+        self.max_views = max_views
+        self.max_pages = max_pages
+        self.hits = 0
+        self.misses = 0
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._search_text: Optional[np.ndarray] = None
+        self._views: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        self._pages: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _values(self, column: str) -> pd.Series:
+        """A column in index order"""
+        values = self.df[column]
+        return values if self.index.order is None else values.iloc[self.index.order]
+    
+    def _sort_order(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Index positions sorted ascending by column (missing values last) and the missing mask"""
+        cached = self._sorted.get(column)
+        if cached is None:
+            values = self._values(column)
+            missing = values.isna().to_numpy()
+            keys = values.to_numpy(dtype='datetime64[ns]' if column == 'Date_parsed' else np.float64)
+            cached = (np.argsort(keys, kind='stable'), missing)
+            self._sorted[column] = cached
+        return cached
+    
+    def _search_values(self) -> np.ndarray:
+        """Lower-cased date and numbers of every row as one string, in index order"""
+        if self._search_text is None:
+            joined = np.full(self.index.row_count, '', dtype=object)
+            for column in self.columns:
+                # Format each distinct value once; dates and counts repeat heavily
+                codes, uniques = pd.factorize(self._values(column))
+                if column == 'Date_parsed':
+                    labels = pd.DatetimeIndex(uniques).strftime('%Y-%m-%d')
+                elif column == 'Winrate_num':
+                    labels = [f"{value:.1f}%" for value in uniques]
+                else:
+                    labels = [str(value) for value in uniques]
+                text = np.append(np.asarray(labels, dtype=object), '')[codes]
+                joined = joined + ' ' + text
+            self._search_text = joined
+        return self._search_text
+    
+    def view(self, start: int, stop: int, sort_by: str = 'Date_parsed',
+             descending: bool = True, query: str = '') -> np.ndarray:
+        """Index positions of rows [start, stop) matching query, in the requested order"""
+        query = query.strip().lower()
+        key = (start, stop, sort_by, descending, query)
+        with self._lock:
+            positions = self._views.get(key)
+            if positions is not None:
+                self._views.move_to_end(key)
+                return positions
         
-        df['Date_parsed'] = None
-        df['Date_display'] = df['Date'].astype(str)
+        if sort_by in self.columns:
+            # Filtering the snapshot-wide order keeps the window sorted without re-sorting it
+            order, missing = self._sort_order(sort_by)
+            positions = order[(order >= start) & (order < stop)]
+            if descending:
+                absent = missing[positions]
+                positions = np.concatenate((positions[~absent][::-1], positions[absent]))
+        else:
+            positions = np.arange(start, stop)
+            if descending:
+                positions = positions[::-1]
         
-        for idx, date_str in enumerate(df['Date']):
-            if pd.isna(date_str) or date_str == '' or str(date_str).strip() == '':
-                continue
-            
-            parsed_date = self._parse_date_string(str(date_str).strip(), idx, len(df))
-            if parsed_date:
-                df.at[idx, 'Date_parsed'] = parsed_date
-                df.at[idx, 'Date_display'] = parsed_date.strftime('%Y-%m-%d')
+        if query:
+            text = pd.Series(self._search_values()[positions])
+            positions = positions[text.str.contains(query, regex=False).to_numpy()]
         
-        return df
+        with self._lock:
+            self._views[key] = positions
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        return positions
     
-    def _parse_date_string(self, date_str: str, idx: int, total_rows: int) -> Optional[datetime.datetime]:
-        """Parse individual date string"""
-        # Handle date ranges
-        range_pattern = re.search(r'(\d{2})/(\d{2})-(\d{2})/(\d{2})', date_str)
-        if range_pattern:
-            start_month, start_day, end_month, end_day = range_pattern.groups()
-            try:
-                current_year = datetime.datetime.now().year
-                return pd.to_datetime(f"{current_year}-{end_month}-{end_day}", format='%Y-%m-%d')
-            except:
-                pass
-        
-        # Handle standard date formats
-        date_patterns = [
-            r'(\d{4})-(\d{1,2})-(\d{1,2})',
-            r'(\d{1,2})/(\d{1,2})/(\d{4})',
-            r'(\d{1,2})-(\d{1,2})-(\d{4})',
-        ]
-        
-        for pattern in date_patterns:
-            match = re.search(pattern, date_str)
-            if match:
-                try:
-                    if pattern == date_patterns[0]:
-                        year, month, day = match.groups()
-                    else:
-                        month, day, year = match.groups()
-                    
-                    return pd.to_datetime(f"{year}-{month}-{day}", format='%Y-%m-%d')
-                except:
-                    continue
-        
-        # Try pandas parsing
-        try:
-            parsed_date = pd.to_datetime(date_str, errors='coerce')
-            if not pd.isna(parsed_date):
-                return parsed_date
-        except:
-            pass
+    def page(self, positions: np.ndarray, view_key: tuple, page: int, page_size: int) -> pd.DataFrame:
+        """Display-ready rows for one page of a view, with the table's column labels"""
+        key = (view_key, page, page_size)
+        monitor = get_perf_monitor()
+        with self._lock:
+            frame = self._pages.get(key)
+            if frame is not None:
+                self._pages.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if frame is not None:
+            monitor.annotate(cache='hit')
+            return frame
         
-        # Default fallback
-        base_date = datetime.datetime.now() - pd.Timedelta(days=total_rows-idx-1)
-        return base_date
+        monitor.annotate(cache='miss')
+        selected = positions[page * page_size:(page + 1) * page_size]
+        rows = selected if self.index.order is None else self.index.order[selected]
+        frame = (
+            self.df.iloc[rows][self.columns]
+            .rename(columns=self.COLUMNS)
+            .reset_index(drop=True)
+        )
+        with self._lock:
+            self._pages[key] = frame
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return frame
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and cached view/page counts"""
+        return {
+            'views': len(self._views),
+            'pages': len(self._pages),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
 
-# ==================== ANALYTICS ENGINE ====================
 class AnalyticsEngine:
     """Handles all analytics and data processing operations"""
     
     @staticmethod
-    def filter_data_by_period(df: Optional[pd.DataFrame], period: str) -> Optional[pd.DataFrame]:
+    def build_stats_index(df: pd.DataFrame) -> StatsIndex:
+        """Build the prefix-sum index for a snapshot"""
+        return StatsIndex(df)
+    
+    @staticmethod
+    def build_rolling_metrics(df: pd.DataFrame, index: Optional[StatsIndex] = None) -> RollingMetrics:
+        """Build the rolling winrate, streak and drawdown arrays for a snapshot, reusing its index if given"""
+        return RollingMetrics(index if index is not None else StatsIndex(df))
+    
+    @staticmethod
+    def build_records_table(df: pd.DataFrame, index: Optional[StatsIndex] = None) -> RecordsTable:
+        """Build the paginated records view for a snapshot, reusing its index if given"""
+        return RecordsTable(
+            df, index if index is not None else StatsIndex(df),
+            Config.RECORDS_VIEW_CACHE_ENTRIES, Config.RECORDS_PAGE_CACHE_ENTRIES
+        )
+    
+    @staticmethod
+    def calculate_period_statistics(index: StatsIndex, period: str) -> Optional[Dict[str, Any]]:
+        """Statistics for a period from the prefix-sum index, without scanning the rows"""
+        return index.statistics(*index.period_positions(period))
+    
+    @staticmethod
+    def window_positions(index: StatsIndex, period: str, start_date=None, end_date=None,
+                         days: Optional[float] = None) -> Tuple[int, int]:
+        """Row positions for a preset period, an inclusive date range ('range') or the last N days ('trailing')"""
+        if period == 'range':
+            return index.date_positions(start_date, end_date)
+        if period == 'trailing':
+            return index.trailing_positions(days if days is not None else 0)
+        return index.period_positions(period)
+    
+    @staticmethod
+    def window_label(period: str, window: Dict[str, Any]) -> str:
+        """Stable text for a period and its window, used in cache keys and traces"""
+        if period == 'range':
+            return f"range:{window.get('start_date') or ''}..{window.get('end_date') or ''}"
+        if period == 'trailing':
+            return f"trailing:{window.get('days')}d"
+        return period
+    
+    @staticmethod
+    def filter_data_by_period(df: Optional[pd.DataFrame], period: str,
+                              index: Optional[StatsIndex] = None) -> Optional[pd.DataFrame]:
         """Filter DataFrame by selected time period"""
         if df is None or df.empty:
             return None
         
-        today = datetime.datetime.now()
-        
-        if 'Date_parsed' not in df.columns or df['Date_parsed'].isna().all():
-            total_rows = len(df)
-            
-            if period == 'week':
-                rows_to_keep = min(7, total_rows)
-                return df.iloc[-rows_to_keep:]
-            elif period == 'month':
-                rows_to_keep = min(30, total_rows)
-                return df.iloc[-rows_to_keep:]
-            else:
-                return df
-        
-        if period == 'week':
-            start_date = today - datetime.timedelta(days=7)
-            filtered_df = df[df['Date_parsed'] >= start_date]
-            return filtered_df if not filtered_df.empty else df.tail(7)
-        elif period == 'month':
-            start_date = today - datetime.timedelta(days=30)
-            filtered_df = df[df['Date_parsed'] >= start_date]
-            return filtered_df if not filtered_df.empty else df.tail(30)
-        else:
-            return df
+        # Binary search on the sorted dates; week/month fall back to the last 7/30 rows when empty
+        if index is None:
+            index = StatsIndex(df)
+        return index.take(df, *index.period_positions(period))
     
     @staticmethod
     def calculate_statistics(df: Optional[pd.DataFrame]) -> Optional[Dict[str, Any]]:
@@ -781,26 +2958,179 @@ class AnalyticsEngine:
         return stats
 
 # ==================== CHART BUILDER ====================
+class Downsampler:
+    """Point-reduction for long chart series that keeps peaks and troughs visible"""
+    
+    @staticmethod
+    def lttb_indices(values: np.ndarray, threshold: int) -> np.ndarray:
+        """Largest-Triangle-Three-Buckets selection of row positions for a line series"""
+        n = len(values)
+        if threshold <= 0 or n <= threshold or threshold < 3:
+            return np.arange(n)
+        
+        y = np.nan_to_num(np.asarray(values, dtype=float))
+        x = np.arange(n, dtype=float)
+        # Bucket edges for the n - 2 interior points; first and last points are always kept
+        edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+        selected = np.empty(threshold, dtype=int)
+        selected[0] = 0
+        selected[-1] = n - 1
+        
+        previous = 0
+        for bucket in range(threshold - 2):
+            start, stop = edges[bucket], edges[bucket + 1]
+            # Average of the next bucket (or the last point) is the third triangle vertex
+            next_start = stop
+            next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+            avg_x = x[next_start:next_stop].mean()
+            avg_y = y[next_start:next_stop].mean()
+            
+            areas = np.abs(
+                (x[previous] - avg_x) * (y[start:stop] - y[previous])
+                - (x[previous] - x[start:stop]) * (avg_y - y[previous])
+            )
+            previous = start + int(areas.argmax())
+            selected[bucket + 1] = previous
+        
+        return selected
+    
+    @staticmethod
+    def minmax_indices(series: List[np.ndarray], threshold: int) -> np.ndarray:
+        """Min/max bucketing for bar series: keep each bucket's extremes of every series"""
+        n = len(series[0]) if series else 0
+        if threshold <= 0 or n <= threshold:
+            return np.arange(n)
+        
+        per_bucket = 2 * len(series)
+        edges = np.linspace(0, n, max(1, threshold // per_bucket) + 1).astype(int)
+        selected = [0, n - 1]
+        for start, stop in zip(edges[:-1], edges[1:]):
+            if stop <= start:
+                continue
+            for values in series:
+                window = np.nan_to_num(np.asarray(values[start:stop], dtype=float))
+                selected.append(start + int(window.argmin()))
+                selected.append(start + int(window.argmax()))
+        
+        return np.unique(selected)
+
+class FigureCache(BoundedLRU):
+    """Bounded LRU cache of serialized Plotly figures, sized by the memory of their JSON"""
+    
+    def __init__(self, max_entries: int, max_bytes: int):
+        super().__init__(max_entries, max_bytes, sizeof=sys.getsizeof)
+    
+    def get_or_build(self, key: tuple, builder: Callable[[], Optional[go.Figure]]) -> Optional[go.Figure]:
+        """Return the cached figure for key, building and storing it on a miss"""
+        monitor = get_perf_monitor()
+        figure_json = self.get(key)
+        if figure_json is not None:
+            monitor.annotate(cache='hit')
+            if not figure_json:
+                return None
+            # The JSON came from a validated figure, so skip re-validation
+            return go.Figure(json.loads(figure_json), _validate=False)
+        
+        monitor.annotate(cache='miss')
+        fig = builder()
+        self.put(key, fig.to_json() if fig is not None else "")
+        return fig
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    """Return the figure cache shared by every session in this process"""
+    return FigureCache(Config.FIGURE_CACHE_MAX_ENTRIES, Config.FIGURE_CACHE_MAX_BYTES)
+
 class ChartBuilder:
     """Handles all chart creation and visualization"""
     
+    CHART_FACTORIES = {
+        'combined': 'create_combined_dashboard_chart',
+        'winrate': 'create_winrate_chart',
+        'tpsl': 'create_tpsl_chart',
+        'rolling': 'create_rolling_chart',
+    }
+    
+    @staticmethod
+    def fingerprint(df: pd.DataFrame) -> str:
+        """Content hash of a frame, used to key cached figures"""
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+        digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+        return digest.hexdigest()
+    
+    @staticmethod
+    def _point_budget(max_points: Optional[int]) -> int:
+        """Resolve the per-series point budget (0 means full resolution)"""
+        return Config.CHART_POINT_BUDGET if max_points is None else max_points
+    
+    @staticmethod
+    def _add_decimation_note(fig: go.Figure, shown: int, total: int):
+        """Tell the viewer the chart shows a downsampled series"""
+        fig.add_annotation(
+            text=f"Downsampled: {shown:,} of {total:,} points",
+            xref="paper", yref="paper", x=1, y=1.08, showarrow=False,
+            xanchor="right", font=dict(color=Config.COLORS['text_muted'], size=11)
+        )
+    
+    @classmethod
+    def get_figure(cls, chart: str, df: pd.DataFrame, period: str, height: int,
+                   margin: Dict[str, int], fingerprint: Optional[str] = None,
+                   max_points: Optional[int] = None) -> Optional[go.Figure]:
+        """Build a chart with its display height and margin, memoized on the frame content"""
+        budget = cls._point_budget(max_points)
+        key = (chart, fingerprint or cls.fingerprint(df), period, height, budget)
+        
+        def build() -> Optional[go.Figure]:
+            fig = getattr(cls, cls.CHART_FACTORIES[chart])(df, max_points=budget)
+            if fig:
+                fig.update_layout(height=height, margin=margin)
+            return fig
+        
+        with get_perf_monitor().stage(f'chart:{chart}', rows=len(df)):
+            return get_figure_cache().get_or_build(key, build)
+    
+    @staticmethod
+    def date_labels(df: pd.DataFrame) -> np.ndarray:
+        """YYYY-MM-DD labels for the plotted rows, formatted on demand; undated rows get ''"""
+        if 'Date_parsed' not in df.columns:
+            return np.full(len(df), '', dtype=object)
+        return df['Date_parsed'].dt.strftime('%Y-%m-%d').fillna('').to_numpy(dtype=object)
+    
+    @staticmethod
+    def _winrate_values(df: pd.DataFrame) -> np.ndarray:
+        """Winrates as float64 rounded back to the sheet's precision, hiding float32 noise in hovers"""
+        return np.round(df['Winrate_num'].to_numpy(dtype=np.float64), 4)
+    
+    @staticmethod
+    def _chronological(df: pd.DataFrame) -> pd.DataFrame:
+        """Rows by date with undated rows last; snapshot slices are already in this order"""
+        if 'Date_parsed' not in df.columns or df['Date_parsed'].isna().all():
+            return df
+        dates = df['Date_parsed']
+        dated = dates.notna().to_numpy()
+        if dated[:dated.sum()].all() and dates.dropna().is_monotonic_increasing:
+            return df
+        return df.sort_values('Date_parsed')
+    
     @staticmethod
-    def create_winrate_chart(df: Optional[pd.DataFrame]) -> Optional[go.Figure]:
+    def create_winrate_chart(df: Optional[pd.DataFrame], max_points: Optional[int] = None) -> Optional[go.Figure]:
         """Create an enhanced winrate chart with better readability"""
         if df is None or df.empty or 'Winrate_num' not in df.columns:
             return None
         
-        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
-            df = df.copy()
-            df['Date_parsed'] = pd.to_datetime(df['Date_parsed'], errors='coerce')
-            df = df.sort_values('Date_parsed')
+        df = ChartBuilder._chronological(df)
         
         fig = go.Figure()
         
+        # Downsample long histories with LTTB so peaks and troughs survive
+        points = Downsampler.lttb_indices(df['Winrate_num'].to_numpy(), ChartBuilder._point_budget(max_points))
+        plot_df = df.iloc[points]
+        
         # Add winrate line
         fig.add_trace(go.Scatter(
-            x=df['Date_display'],
-            y=df['Winrate_num'],
+            x=ChartBuilder.date_labels(plot_df),
+            y=ChartBuilder._winrate_values(plot_df),
             mode='lines+markers',
             name='Winrate',
             line=dict(color=Config.COLORS['primary'], width=4),
@@ -836,24 +3166,30 @@ class ChartBuilder:
             margin=dict(l=60, r=60, t=60, b=60)
         )
         
+        if len(plot_df) < len(df):
+            ChartBuilder._add_decimation_note(fig, len(plot_df), len(df))
+        
         return fig
     
     @staticmethod
-    def create_tpsl_chart(df: Optional[pd.DataFrame]) -> Optional[go.Figure]:
+    def create_tpsl_chart(df: Optional[pd.DataFrame], max_points: Optional[int] = None) -> Optional[go.Figure]:
         """Create TP/SL comparison chart with better readability"""
         if df is None or df.empty or 'TP' not in df.columns or 'SL' not in df.columns:
             return None
         
-        if 'Date_parsed' in df.columns and not df['Date_parsed'].isna().all():
-            df = df.copy()
-            df['Date_parsed'] = pd.to_datetime(df['Date_parsed'], errors='coerce')
-            df = df.sort_values('Date_parsed')
+        df = ChartBuilder._chronological(df)
         
         fig = go.Figure()
         
+        # Keep each bucket's highest and lowest bars on long histories
+        points = Downsampler.minmax_indices(
+            [df['TP'].to_numpy(), df['SL'].to_numpy()], ChartBuilder._point_budget(max_points)
+        )
+        plot_df = df.iloc[points]
+        
         # Add TP bars with Binance green
         fig.add_trace(go.Bar(
-            x=df['Date_display'], y=df['TP'], name='Take Profit',
+            x=ChartBuilder.date_labels(plot_df), y=plot_df['TP'], name='Take Profit',
             marker_color=Config.COLORS['success'],
             hovertemplate='<b>Date:</b> %{x}<br><b>TP:</b> %{y}<extra></extra>',
             opacity=0.9
@@ -861,7 +3197,7 @@ class ChartBuilder:
         
         # Add SL bars with Binance red
         fig.add_trace(go.Bar(
-            x=df['Date_display'], y=df['SL'], name='Stop Loss',
+            x=ChartBuilder.date_labels(plot_df), y=plot_df['SL'], name='Stop Loss',
             marker_color=Config.COLORS['danger'],
             hovertemplate='<b>Date:</b> %{x}<br><b>SL:</b> %{y}<extra></extra>',
             opacity=0.9
@@ -884,16 +3220,73 @@ class ChartBuilder:
             margin=dict(l=60, r=60, t=60, b=60)
         )
         
+        if len(plot_df) < len(df):
+            ChartBuilder._add_decimation_note(fig, len(plot_df), len(df))
+        
+        return fig
+    
+    @staticmethod
+    def create_rolling_chart(df: Optional[pd.DataFrame], max_points: Optional[int] = None) -> Optional[go.Figure]:
+        """Rolling TP+SL weighted winrates above the TP-SL drawdown, from a RollingMetrics frame"""
+        if df is None or df.empty or 'Drawdown' not in df.columns:
+            return None
+        
+        budget = ChartBuilder._point_budget(max_points)
+        series = [df[f'Winrate_{days}d'].to_numpy() for days in RollingMetrics.WINDOWS]
+        points = np.union1d(
+            Downsampler.lttb_indices(np.nan_to_num(series[1]), budget),
+            Downsampler.lttb_indices(df['Drawdown'].to_numpy(dtype=np.float64), budget)
+        )
+        plot_df = df.iloc[points]
+        dates = ChartBuilder.date_labels(plot_df)
+        
+        fig = plotly_subplots.make_subplots(
+            rows=2, cols=1, shared_xaxes=True, row_heights=[0.65, 0.35], vertical_spacing=0.08,
+            subplot_titles=('Rolling Winrate (TP+SL weighted)', 'Drawdown (TP - SL)')
+        )
+        colors = {7: Config.COLORS['primary'], 30: Config.COLORS['success'], 90: '#2196F3'}
+        for days in RollingMetrics.WINDOWS:
+            fig.add_trace(
+                go.Scatter(x=dates, y=np.round(plot_df[f'Winrate_{days}d'].to_numpy(), 2),
+                           mode='lines', name=f'{days}D', line=dict(color=colors[days], width=2),
+                           hovertemplate=f'<b>{days}D winrate:</b> %{{y}}%<extra></extra>'),
+                row=1, col=1
+            )
+        fig.add_trace(
+            go.Scatter(x=dates, y=-plot_df['Drawdown'].to_numpy(), mode='lines', name='Drawdown',
+                       fill='tozeroy', line=dict(color=Config.COLORS['danger'], width=2),
+                       hovertemplate='<b>Drawdown:</b> %{y}<extra></extra>'),
+            row=2, col=1
+        )
+        
+        fig.update_layout(
+            height=500,
+            plot_bgcolor=Config.COLORS['background'],
+            paper_bgcolor=Config.COLORS['background'],
+            font=dict(color=Config.COLORS['text_primary'], size=12),
+            legend=dict(orientation='h', y=1.08, font=dict(color=Config.COLORS['text_primary'])),
+            margin=dict(l=60, r=60, t=80, b=60)
+        )
+        fig.update_yaxes(range=[0, 100], gridcolor=Config.COLORS['grid'], row=1, col=1)
+        fig.update_yaxes(gridcolor=Config.COLORS['grid'], row=2, col=1)
+        fig.update_xaxes(gridcolor=Config.COLORS['grid'])
+        
+        if len(plot_df) < len(df):
+            ChartBuilder._add_decimation_note(fig, len(plot_df), len(df))
+        
         return fig
     
     @staticmethod
-    def create_combined_dashboard_chart(df: Optional[pd.DataFrame]) -> Optional[go.Figure]:
+    def create_combined_dashboard_chart(df: Optional[pd.DataFrame], max_points: Optional[int] = None) -> Optional[go.Figure]:
         """Create combined dashboard chart with enhanced readability"""
         if df is None or df.empty:
             return None
         
+        budget = ChartBuilder._point_budget(max_points)
+        max_shown = 0
+        
         # Create subplots
-        fig = make_subplots(
+        fig = plotly_subplots.make_subplots(
             rows=2, cols=2,
             subplot_titles=('Winrate Trend', 'TP vs SL', 'Cumulative Performance', 'Daily Signals'),
             specs=[[{"secondary_y": False}, {"secondary_y": False}],
@@ -903,8 +3296,10 @@ class ChartBuilder:
         
         # Winrate trend
         if 'Winrate_num' in df.columns:
+            winrate_df = df.iloc[Downsampler.lttb_indices(df['Winrate_num'].to_numpy(), budget)]
+            max_shown = max(max_shown, len(winrate_df))
             fig.add_trace(
-                go.Scatter(x=df['Date_display'], y=df['Winrate_num'], 
+                go.Scatter(x=ChartBuilder.date_labels(winrate_df), y=ChartBuilder._winrate_values(winrate_df), 
                           mode='lines+markers', name='Winrate',
                           line=dict(color=Config.COLORS['primary'], width=3),
                           marker=dict(size=6, color=Config.COLORS['primary'])),
@@ -914,28 +3309,39 @@ class ChartBuilder:
         
         # TP vs SL
         if 'TP' in df.columns and 'SL' in df.columns:
+            tp_values = df['TP'].to_numpy()
+            sl_values = df['SL'].to_numpy()
+            bars_df = df.iloc[Downsampler.minmax_indices([tp_values, sl_values], budget)]
+            bar_dates = ChartBuilder.date_labels(bars_df)
+            max_shown = max(max_shown, len(bars_df))
             fig.add_trace(
-                go.Bar(x=df['Date_display'], y=df['TP'], name='TP', 
+                go.Bar(x=bar_dates, y=bars_df['TP'], name='TP', 
                        marker_color=Config.COLORS['success'], opacity=0.9),
                 row=1, col=2
             )
             fig.add_trace(
-                go.Bar(x=df['Date_display'], y=df['SL'], name='SL',
+                go.Bar(x=bar_dates, y=bars_df['SL'], name='SL',
                        marker_color=Config.COLORS['danger'], opacity=0.9),
                 row=1, col=2
             )
             
-            # Cumulative performance
-            cumulative_tp = df['TP'].cumsum()
-            cumulative_sl = df['SL'].cumsum()
+            # Cumulative performance, summed over the full series before downsampling
+            cumulative_tp = np.cumsum(tp_values, dtype=np.int64)
+            cumulative_sl = np.cumsum(sl_values, dtype=np.int64)
+            cumulative_points = np.union1d(
+                Downsampler.lttb_indices(cumulative_tp, budget),
+                Downsampler.lttb_indices(cumulative_sl, budget)
+            )
+            cumulative_dates = ChartBuilder.date_labels(df.iloc[cumulative_points])
+            max_shown = max(max_shown, len(cumulative_points))
             fig.add_trace(
-                go.Scatter(x=df['Date_display'], y=cumulative_tp, 
+                go.Scatter(x=cumulative_dates, y=cumulative_tp[cumulative_points], 
                           mode='lines', name='Cumulative TP',
                           line=dict(color=Config.COLORS['success'], width=3)),
                 row=2, col=1
             )
             fig.add_trace(
-                go.Scatter(x=df['Date_display'], y=cumulative_sl,
+                go.Scatter(x=cumulative_dates, y=cumulative_sl[cumulative_points],
                           mode='lines', name='Cumulative SL',
                           line=dict(color=Config.COLORS['danger'], width=3)),
                 row=2, col=1
@@ -943,8 +3349,10 @@ class ChartBuilder:
         
         # Daily signals
         if 'Total_Signal' in df.columns:
+            signals_df = df.iloc[Downsampler.minmax_indices([df['Total_Signal'].to_numpy()], budget)]
+            max_shown = max(max_shown, len(signals_df))
             fig.add_trace(
-                go.Bar(x=df['Date_display'], y=df['Total_Signal'], 
+                go.Bar(x=ChartBuilder.date_labels(signals_df), y=signals_df['Total_Signal'], 
                        name='Daily Signals', marker_color=Config.COLORS['primary'], opacity=0.9),
                 row=2, col=2
             )
@@ -972,8 +3380,128 @@ class ChartBuilder:
         fig.update_yaxes(gridcolor=Config.COLORS['grid'],
                         tickfont=dict(color=Config.COLORS['text_primary'], size=10))
         
+        if 0 < max_shown < len(df):
+            ChartBuilder._add_decimation_note(fig, max_shown, len(df))
+        
         return fig
 
+# ==================== EXPORTS ====================
+class ExportCache(BoundedLRU):
+    """Bounded LRU cache of generated export files, sized by their length in bytes"""
+    
+    def __init__(self, max_entries: int, max_bytes: int):
+        super().__init__(max_entries, max_bytes, sizeof=len)
+    
+    def get_or_build(self, key: Optional[tuple], builder: Callable[[], bytes]) -> bytes:
+        """Return the cached file for key, building and storing it on a miss; None keys are not cached"""
+        monitor = get_perf_monitor()
+        if key is not None:
+            data = self.get(key)
+            if data is not None:
+                monitor.annotate(cache='hit', bytes=len(data))
+                return data
+        
+        monitor.annotate(cache='miss')
+        data = builder()
+        monitor.annotate(bytes=len(data))
+        if key is not None:
+            self.put(key, data)
+        return data
+
+@st.cache_resource(show_spinner=False)
+def get_export_cache() -> ExportCache:
+    """Return the export cache shared by every session in this process"""
+    return ExportCache(Config.EXPORT_CACHE_MAX_ENTRIES, Config.EXPORT_CACHE_MAX_BYTES)
+
+class DataExporter:
+    """Writes records and statistics as CSV, Parquet or JSON files"""
+    
+    # format -> (MIME type, file extension)
+    FORMATS = {
+        'csv': ('text/csv', 'csv'),
+        'parquet': ('application/vnd.apache.parquet', 'parquet'),
+        'json': ('application/json', 'json'),
+    }
+    
+    # Snapshot columns and their names in exported files
+    RECORD_COLUMNS = {
+        'Date_parsed': 'Date',
+        'Total_Signal': 'Total_Signal',
+        'Finished': 'Finished',
+        'TP': 'TP',
+        'SL': 'SL',
+        'Winrate_num': 'Winrate',
+    }
+    
+    @staticmethod
+    def available_formats() -> List[str]:
+        """Formats that can be written here; Parquet needs pyarrow"""
+        formats = ['csv', 'json']
+        if importlib.util.find_spec('pyarrow') is not None:
+            formats.insert(1, 'parquet')
+        return formats
+    
+    @classmethod
+    def _record_chunk(cls, chunk: pd.DataFrame, fmt: str) -> pd.DataFrame:
+        """Export columns for a slice of rows; text formats get YYYY-MM-DD dates"""
+        columns = [column for column in cls.RECORD_COLUMNS if column in chunk.columns]
+        out = chunk[columns].rename(columns=cls.RECORD_COLUMNS).reset_index(drop=True)
+        if 'Winrate' in out.columns:
+            # float64 rounded back to the sheet's precision, without float32 noise
+            out['Winrate'] = np.round(out['Winrate'].to_numpy(dtype=np.float64), 4)
+        if 'Date' in out.columns and fmt != 'parquet':
+            out['Date'] = out['Date'].dt.strftime('%Y-%m-%d')
+        return out
+    
+    @classmethod
+    def write_records(cls, df: pd.DataFrame, fmt: str, chunk_rows: int) -> bytes:
+        """Serialize rows chunk by chunk so the intermediate copies stay small"""
+        buffer = io.BytesIO()
+        chunks = (df.iloc[i:i + chunk_rows] for i in range(0, max(len(df), 1), chunk_rows))
+        
+        if fmt == 'csv':
+            for i, chunk in enumerate(chunks):
+                cls._record_chunk(chunk, fmt).to_csv(buffer, header=(i == 0), index=False)
+        elif fmt == 'json':
+            buffer.write(b'[')
+            for i, chunk in enumerate(chunks):
+                body = cls._record_chunk(chunk, fmt).to_json(orient='records')[1:-1]
+                if body:
+                    buffer.write((b',' if buffer.tell() > 1 else b'') + body.encode('utf-8'))
+            buffer.write(b']')
+        elif fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            writer = None
+            try:
+                # One row group per chunk
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(cls._record_chunk(chunk, fmt), preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(buffer, table.schema)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        return buffer.getvalue()
+    
+    @staticmethod
+    def write_stats(stats: Dict[str, Any], fmt: str) -> bytes:
+        """Serialize a statistics dict; tabular formats get a single row"""
+        if fmt == 'json':
+            return json.dumps(stats, indent=2, default=str).encode('utf-8')
+        frame = pd.DataFrame([stats])
+        if fmt == 'csv':
+            return frame.to_csv(index=False).encode('utf-8')
+        if fmt == 'parquet':
+            buffer = io.BytesIO()
+            frame.to_parquet(buffer, index=False)
+            return buffer.getvalue()
+        raise ValueError(f"Unknown export format: {fmt}")
+
 # ==================== UI COMPONENTS ====================
 class UIComponents:
     """Manages all UI components and rendering"""
@@ -1006,18 +3534,51 @@ class UIComponents:
             
             period = st.radio(
                 "",
-                options=["week", "month", "all"],
-                format_func=lambda x: {"week": "📅 Last Week", "month": "📆 Last Month", "all": "📈 All Time"}[x],
+                options=["week", "month", "all", "range", "trailing"],
+                format_func=lambda x: {
+                    "week": "📅 Last Week", "month": "📆 Last Month", "all": "📈 All Time",
+                    "range": "🗓️ Date Range", "trailing": "⏱️ Last N Days"
+                }[x],
                 horizontal=True,
                 key="period_selector"
             )
             
+            # Extra inputs for custom windows
+            window: Dict[str, Any] = {}
+            today = datetime.date.today()
+            if period == "range":
+                selected = st.date_input(
+                    "Date range", value=(today - datetime.timedelta(days=90), today), key="custom_date_range"
+                )
+                selected = tuple(selected) if isinstance(selected, (list, tuple)) else (selected,)
+                window['start_date'] = selected[0] if selected else None
+                window['end_date'] = selected[1] if len(selected) > 1 else None
+            elif period == "trailing":
+                window['days'] = int(st.number_input(
+                    "Days", min_value=1, max_value=36500, value=90, step=1, key="trailing_days"
+                ))
+            
             st.markdown('<div style="margin-top: 1.5rem;"></div>', unsafe_allow_html=True)
             load_button = st.button("🚀 LOAD TRADING STATISTICS", use_container_width=True, type="primary")
             st.markdown('</div>', unsafe_allow_html=True)
         
-        return period, load_button
-    
+        return period, load_button, window
+
+    @staticmethod
+    def render_data_freshness(snapshot_info: Dict[str, Any]):
+        """Render a small "data as of" note for the cached snapshot"""
+        fetched_at = snapshot_info.get('fetched_at')
+        if fetched_at is None:
+            return
+
+        note = f"🕒 Data as of {fetched_at.strftime('%H:%M')}"
+        upstream = snapshot_info.get('upstream') or {}
+        if upstream.get('circuit') in (CircuitBreaker.OPEN, CircuitBreaker.HALF_OPEN):
+            note += " · ⚠️ data source unavailable, showing last good data"
+        elif snapshot_info.get('refreshing'):
+            note += " · refreshing in background"
+        st.markdown(f'<p style="color: #C7C7C7; font-size: clamp(0.75rem, 2vw, 0.9rem); text-align: center;">{note}</p>', unsafe_allow_html=True)
+
     @staticmethod
     def render_stats_cards(stats: Dict[str, Any]):
         """Render statistics cards with completion rate instead of global users"""
@@ -1063,7 +3624,8 @@ class UIComponents:
             """, unsafe_allow_html=True)
     
     @staticmethod
-    def render_insights(stats: Dict[str, Any], filtered_df: pd.DataFrame):
+    def render_insights(stats: Dict[str, Any], filtered_df: pd.DataFrame,
+                        performance: Optional[Dict[str, Any]] = None):
         """Render trading insights with enhanced readability"""
         st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin: 2rem 0 1.5rem 0; text-align: center;">💡 Trading Insights</h3>', unsafe_allow_html=True)
         
@@ -1095,8 +3657,18 @@ class UIComponents:
             """, unsafe_allow_html=True)
         
         with col2:
-            # Trend analysis
-            if len(filtered_df) >= 3 and 'Winrate_num' in filtered_df.columns:
+            # Trend analysis: weighted 7-day winrate against the 30-day one
+            rolling = (performance or {}).get('rolling_winrate', {})
+            if rolling.get(7) is not None and rolling.get(30) is not None:
+                if rolling[7] > rolling[30]:
+                    trend_icon = "📈"
+                    trend_text = "Improving Trend"
+                    trend_color = Config.COLORS['success']
+                else:
+                    trend_icon = "📉"
+                    trend_text = "Declining Trend"
+                    trend_color = Config.COLORS['danger']
+            elif len(filtered_df) >= 3 and 'Winrate_num' in filtered_df.columns:
                 recent_avg = filtered_df['Winrate_num'].tail(3).mean()
                 overall_avg = filtered_df['Winrate_num'].mean()
                 
@@ -1148,6 +3720,73 @@ class UIComponents:
             </div>
             """, unsafe_allow_html=True)
     
+    @staticmethod
+    def render_performance_cards(performance: Dict[str, Any], filtered_df: pd.DataFrame):
+        """Render rolling winrates, streaks and drawdown for the selected window"""
+        rolling = performance['rolling_winrate']
+        rolling_text = " · ".join(
+            f"{days}D {value:.1f}%" for days, value in rolling.items() if value is not None
+        ) or "Not enough dated rows"
+        
+        streak = performance['current_streak']
+        streak_type = performance['current_streak_type']
+        if streak and streak_type == 'win':
+            streak_icon, streak_text, streak_color = "🔥", f"{streak}-Day Win Streak", Config.COLORS['success']
+        elif streak and streak_type == 'loss':
+            streak_icon, streak_text, streak_color = "🧊", f"{streak}-Day Losing Streak", Config.COLORS['danger']
+        else:
+            streak_icon, streak_text, streak_color = "➖", "No Active Streak", "#2196F3"
+        
+        trough_date = ""
+        if performance['max_drawdown'] > 0 and 'Date_parsed' in filtered_df.columns:
+            trough = filtered_df['Date_parsed'].iloc[performance['max_drawdown_offset']]
+            if not pd.isna(trough):
+                trough_date = f" (trough {trough:%Y-%m-%d})"
+        
+        cards = [
+            ("📊", "Rolling Winrate", Config.COLORS['primary'], rolling_text),
+            (streak_icon, streak_text, streak_color,
+             f"Longest: {performance['longest_win_streak']} wins / {performance['longest_losing_streak']} losses"),
+            ("📉", f"Max Drawdown: {performance['max_drawdown']:,}", Config.COLORS['warning'],
+             f"TP − SL below peak{trough_date}"),
+        ]
+        for col, (icon, label, color, detail) in zip(st.columns(3), cards):
+            with col:
+                st.markdown(f"""
+                <div class="stat-card">
+                    <div class="stat-icon">{icon}</div>
+                    <div class="stat-label" style="color: {color}; font-weight: 600;">{label}</div>
+                    <div style="font-size: clamp(0.75rem, 2vw, 0.9rem); margin-top: 0.5rem; color: #FFFFFF;">
+                        {detail}
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    @staticmethod
+    def render_debug_panel(trace: List[Dict[str, Any]], summary: Dict[str, Dict[str, float]],
+                           snapshot_info: Dict[str, Any], figure_cache_stats: Dict[str, int],
+                           export_cache_stats: Optional[Dict[str, int]] = None):
+        """Render the hidden operator panel with per-stage timings"""
+        with st.expander("🛠️ Operator debug panel", expanded=False):
+            st.markdown("**Last load (this session)**")
+            if trace:
+                st.dataframe(pd.DataFrame(trace), use_container_width=True, hide_index=True)
+            else:
+                st.caption("No load recorded in this session yet.")
+            
+            st.markdown("**Rolling stage latency (this process)**")
+            if summary:
+                st.dataframe(
+                    pd.DataFrame.from_dict(summary, orient='index').rename_axis('stage').reset_index(),
+                    use_container_width=True, hide_index=True
+                )
+            
+            st.markdown("**Caches**")
+            st.json(json.dumps(
+                {'snapshot': snapshot_info, 'figures': figure_cache_stats, 'exports': export_cache_stats},
+                default=str
+            ))
+    
     @staticmethod
     def render_footer():
         """Render responsive footer with better contrast"""
@@ -1186,22 +3825,60 @@ class LuxQuantDashboard:
     def run(self):
         """Main application runner"""
         self.configure_page()
+        get_startup_report(EAGER_IMPORT_SECONDS)
         StyleManager.apply_custom_css()
+        get_background_refresher()
         
         # Render header
         self.ui.render_header()
         
-        # Period selector and load button
-        period, load_button = self.ui.render_period_selector()
-        
-        if load_button:
-            self._handle_data_loading(period)
+        # Period selector, load button and results
+        self._render_analysis_section()
         
         # Footer only
         self.ui.render_footer()
+        
+        if self._debug_panel_enabled():
+            self.ui.render_debug_panel(
+                st.session_state.get('perf_trace', []),
+                get_perf_monitor().summary(),
+                self.data_manager.snapshot_info(),
+                get_figure_cache().stats(),
+                get_export_cache().stats()
+            )
+    
+    @partial_rerun
+    def _render_analysis_section(self):
+        """Period selector and results; switching period re-renders only this section.
+
+        After the first LOAD the results are shown on every rerun from the in-memory
+        snapshot, so changing the period needs no second click and no refetch.
+        """
+        period, load_button, window = self.ui.render_period_selector()
+        if load_button:
+            st.session_state.data_requested = True
+        if not st.session_state.get('data_requested'):
+            return
+        
+        monitor = get_perf_monitor()
+        with monitor.trace() as trace:
+            label = self.analytics.window_label(period, window)
+            with monitor.stage('load_total', period=label, trigger='load' if load_button else 'rerun'):
+                self._handle_data_loading(period, window)
+        st.session_state.perf_trace = trace
     
-    def _handle_data_loading(self, period: str):
+    def _debug_panel_enabled(self) -> bool:
+        """Operator panel is on via the DEBUG_PANEL secret or a matching ?debug= token"""
+        if Config.DEBUG_PANEL:
+            return True
+        token = st.query_params.get('debug')
+        return bool(Config.DEBUG_PANEL_TOKEN) and token == Config.DEBUG_PANEL_TOKEN
+    
+    def _handle_data_loading(self, period: str, window: Optional[Dict[str, Any]] = None):
         """Handle data loading and display logic"""
+        window = window or {}
+        label = self.analytics.window_label(period, window)
+        monitor = get_perf_monitor()
         with st.spinner("🔄 Loading trading data..."):
             try:
                 # Get and filter data
@@ -1211,131 +3888,365 @@ class LuxQuantDashboard:
                     st.warning("⚠️ No trading data available for the selected period.")
                     return
                 
-                filtered_df = self.analytics.filter_data_by_period(df, period)
+                with monitor.stage('filter', period=label) as record:
+                    stats_index = self.data_manager.get_derived('stats_index', df, self.analytics.build_stats_index)
+                    positions = self.analytics.window_positions(stats_index, period, **window)
+                    filtered_df = stats_index.take(df, *positions)
+                    record['rows'] = len(filtered_df)
                 
                 if filtered_df is None or filtered_df.empty:
                     st.warning("⚠️ No data available for the selected period.")
                     return
                 
                 st.success("✅ Trading data loaded successfully!")
+                self.ui.render_data_freshness(self.data_manager.snapshot_info())
+
+                # Calculate and display statistics from the prefix-sum index
+                with monitor.stage('stats', period=label):
+                    stats = stats_index.statistics(*positions)
                 
-                # Calculate and display statistics
-                stats = self.analytics.calculate_statistics(filtered_df)
+                with monitor.stage('rolling', period=label):
+                    rolling_metrics = self.data_manager.get_derived(
+                        'rolling_metrics', df,
+                        lambda frame: self.analytics.build_rolling_metrics(frame, stats_index)
+                    )
+                    performance = rolling_metrics.summary(*positions)
+                    rolling_df = rolling_metrics.frame(df, *positions)
                 
                 if stats:
                     self.ui.render_stats_cards(stats)
                 
                 # Render charts
-                self._render_charts(filtered_df)
+                self._render_charts(filtered_df, label, rolling_df)
                 
                 # Render data table with enhanced styling
-                self._render_data_table(filtered_df)
+                with monitor.stage('table', rows=len(filtered_df)):
+                    records = self.data_manager.get_derived(
+                        'records_table', df,
+                        lambda frame: self.analytics.build_records_table(frame, stats_index)
+                    )
+                    self._render_data_table(records, positions, filtered_df)
+                
+                # Downloads of the same window, generated only when asked for
+                self._render_exports(df, filtered_df, positions, label, stats)
                 
                 # Render insights
                 if stats:
-                    self.ui.render_insights(stats, filtered_df)
+                    self.ui.render_insights(stats, filtered_df, performance)
+                if performance:
+                    self.ui.render_performance_cards(performance, filtered_df)
                 
             except Exception as e:
                 st.error(f"❌ Error loading data: {str(e)}")
                 st.error(f"Debug info: {type(e).__name__}")
     
-    def _render_charts(self, filtered_df: pd.DataFrame):
+    def _render_charts(self, filtered_df: pd.DataFrame, period: str,
+                       rolling_df: Optional[pd.DataFrame] = None):
         """Render all charts with enhanced readability"""
         st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin: 2rem 0 1.5rem 0; text-align: center;">📊 Performance Analytics</h3>', unsafe_allow_html=True)
         
+        # Figures are memoized on the frame content, period and viewport height
+        fingerprint = self.chart_builder.fingerprint(filtered_df)
+        mobile_view = st.session_state.get('mobile_view', False)
+        
+        # Long histories are downsampled; viewers can opt into every point to zoom in
+        max_points = None
+        if 0 < Config.CHART_POINT_BUDGET < len(filtered_df):
+            full_resolution = st.toggle(
+                "🔍 Full resolution charts (slower on mobile)", key="full_resolution_charts"
+            )
+            max_points = 0 if full_resolution else None
+        
         # Combined dashboard - responsive height
-        combined_chart = self.chart_builder.create_combined_dashboard_chart(filtered_df)
+        combined_chart = self.chart_builder.get_figure(
+            'combined', filtered_df, period,
+            height=600 if mobile_view else 700,
+            margin=dict(l=40, r=40, t=60, b=40),
+            fingerprint=fingerprint, max_points=max_points
+        )
         if combined_chart:
-            # Update chart for mobile responsiveness
-            combined_chart.update_layout(
-                height=600 if st.session_state.get('mobile_view', False) else 700,
-                margin=dict(l=40, r=40, t=60, b=40)
-            )
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-            st.plotly_chart(combined_chart, use_container_width=True, config={'responsive': True})
+            with get_perf_monitor().stage('plotly_chart:combined'):
+                st.plotly_chart(combined_chart, use_container_width=True, config={'responsive': True})
             st.markdown('</div>', unsafe_allow_html=True)
         
         # Individual charts with responsive grid
         col1, col2 = st.columns([1, 1])
         
         with col1:
-            winrate_chart = self.chart_builder.create_winrate_chart(filtered_df)
+            winrate_chart = self.chart_builder.get_figure(
+                'winrate', filtered_df, period,
+                height=300 if mobile_view else 350,
+                margin=dict(l=40, r=40, t=50, b=40),
+                fingerprint=fingerprint, max_points=max_points
+            )
             if winrate_chart:
-                # Update chart for responsiveness
-                winrate_chart.update_layout(
-                    height=300 if st.session_state.get('mobile_view', False) else 350,
-                    margin=dict(l=40, r=40, t=50, b=40)
-                )
                 st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.plotly_chart(winrate_chart, use_container_width=True, config={'responsive': True})
+                with get_perf_monitor().stage('plotly_chart:winrate'):
+                    st.plotly_chart(winrate_chart, use_container_width=True, config={'responsive': True})
                 st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
-            tpsl_chart = self.chart_builder.create_tpsl_chart(filtered_df)
+            tpsl_chart = self.chart_builder.get_figure(
+                'tpsl', filtered_df, period,
+                height=300 if mobile_view else 350,
+                margin=dict(l=40, r=40, t=50, b=40),
+                fingerprint=fingerprint, max_points=max_points
+            )
             if tpsl_chart:
-                # Update chart for responsiveness
-                tpsl_chart.update_layout(
-                    height=300 if st.session_state.get('mobile_view', False) else 350,
-                    margin=dict(l=40, r=40, t=50, b=40)
-                )
                 st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-                st.plotly_chart(tpsl_chart, use_container_width=True, config={'responsive': True})
+                with get_perf_monitor().stage('plotly_chart:tpsl'):
+                    st.plotly_chart(tpsl_chart, use_container_width=True, config={'responsive': True})
+                st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Rolling winrate and drawdown, sliced from the per-snapshot arrays. They also
+        # depend on rows before the window, so the figure is keyed on rolling_df itself
+        if rolling_df is not None and not rolling_df.empty:
+            rolling_chart = self.chart_builder.get_figure(
+                'rolling', rolling_df, period,
+                height=420 if mobile_view else 500,
+                margin=dict(l=40, r=40, t=80, b=40),
+                max_points=max_points
+            )
+            if rolling_chart:
+                st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+                with get_perf_monitor().stage('plotly_chart:rolling'):
+                    st.plotly_chart(rolling_chart, use_container_width=True, config={'responsive': True})
                 st.markdown('</div>', unsafe_allow_html=True)
     
-    def _render_data_table(self, filtered_df: pd.DataFrame):
-        """Render enhanced data table with Binance styling"""
+    def _render_data_table(self, records: RecordsTable, positions: Tuple[int, int],
+                           filtered_df: pd.DataFrame):
+        """Render the records table one page at a time, sorted and searched on the server"""
         st.markdown('<h3 style="color: #F0B90B; font-size: clamp(1.2rem, 3vw, 1.8rem); font-weight: 700; margin: 2rem 0 1.5rem 0; text-align: center;">📋 Detailed Trading Records</h3>', unsafe_allow_html=True)
         
-        # Prepare display columns
-        display_cols = []
-        available_cols = ['Date', 'Total_Signal', 'Finished', 'TP', 'SL', 'Winrate_pct']
-        for col in available_cols:
-            if col in filtered_df.columns:
-                display_cols.append(col)
-        
-        # Display the data table with enhanced Binance styling
         st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-        if display_cols:
-            # Create a responsive dataframe display
-            display_df = filtered_df[display_cols].copy()
-            
-            # Rename columns for better display
-            column_rename = {
-                'Date': '📅 Date',
-                'Total_Signal': '📊 Total Signal',
-                'Finished': '✅ Finished',
-                'TP': '🎯 TP',
-                'SL': '🛑 SL',
-                'Winrate_pct': '📈 Winrate'
-            }
-            
-            display_df = display_df.rename(columns={k: v for k, v in column_rename.items() if k in display_df.columns})
-            
-            # Format for better mobile display
-            if len(display_df.columns) > 4:
-                st.markdown(
-                    '<div style="overflow-x: auto; -webkit-overflow-scrolling: touch; border-radius: 12px;">',
-                    unsafe_allow_html=True
-                )
-            
-            st.dataframe(
-                display_df, 
-                use_container_width=True, 
-                height=300,
-                hide_index=True
-            )
-            
-            if len(display_df.columns) > 4:
-                st.markdown('</div>', unsafe_allow_html=True)
-        else:
+        if not records.columns:
             st.dataframe(
                 filtered_df, 
                 use_container_width=True, 
                 height=300,
                 hide_index=True
             )
+            st.markdown('</div>', unsafe_allow_html=True)
+            return
+        
+        # Table controls
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            query = st.text_input("🔍 Search", key="records_search", placeholder="e.g. 2024-03 or 61.5%")
+        with col2:
+            sort_by = st.selectbox(
+                "Sort by", records.columns, key="records_sort",
+                format_func=lambda column: RecordsTable.COLUMNS[column]
+            )
+        with col3:
+            descending = st.selectbox(
+                "Order", [True, False], key="records_descending",
+                format_func=lambda desc: "⬇️ Descending" if desc else "⬆️ Ascending"
+            )
+        
+        view_key = (*positions, sort_by, descending, query.strip().lower())
+        view = records.view(*positions, sort_by=sort_by, descending=descending, query=query)
+        
+        # Back to the first page whenever the window, sort or search changes
+        if st.session_state.get('records_view_key') != view_key:
+            st.session_state.records_view_key = view_key
+            st.session_state.records_page = 1
+        
+        page_size = Config.RECORDS_PAGE_SIZE
+        page_count = max(1, -(-len(view) // page_size))
+        st.session_state.records_page = min(st.session_state.get('records_page', 1), page_count)
+        
+        page = st.number_input(
+            f"Page (of {page_count:,})", min_value=1, max_value=page_count, step=1, key="records_page"
+        )
+        page_df = records.page(view, view_key, int(page) - 1, page_size)
+        
+        # Format for better mobile display
+        if len(page_df.columns) > 4:
+            st.markdown(
+                '<div style="overflow-x: auto; -webkit-overflow-scrolling: touch; border-radius: 12px;">',
+                unsafe_allow_html=True
+            )
+        
+        # Dates and percentages are formatted by the browser, not stored as strings
+        st.dataframe(
+            page_df, 
+            use_container_width=True, 
+            height=300,
+            hide_index=True,
+            column_config={
+                '📅 Date': st.column_config.DateColumn(format="YYYY-MM-DD"),
+                '📈 Winrate': st.column_config.NumberColumn(format="%.1f%%"),
+            }
+        )
+        
+        if len(page_df.columns) > 4:
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        first = (int(page) - 1) * page_size
+        if len(view):
+            st.caption(
+                f"Showing {first + 1:,}–{min(first + page_size, len(view)):,} of {len(view):,} records"
+            )
+        else:
+            st.caption("No records match the search")
         st.markdown('</div>', unsafe_allow_html=True)
 
+    def _render_exports(self, df: pd.DataFrame, filtered_df: pd.DataFrame, positions: Tuple[int, int],
+                        period: str, stats: Optional[Dict[str, Any]]):
+        """Offer the window's records and statistics as downloads, built on request and cached"""
+        col1, col2 = st.columns([1, 2])
+        with col1:
+            fmt = st.selectbox(
+                "Export format", DataExporter.available_formats(), key="export_format", format_func=str.upper
+            )
+        
+        # Exports are keyed by snapshot version and row positions; frames outside the cache are not stored
+        version = self.data_manager.snapshot_version(df)
+        request = (version, *positions, fmt)
+        with col2:
+            st.markdown('<div style="height: 1.75rem;"></div>', unsafe_allow_html=True)
+            if st.button("📦 Prepare export", key="prepare_export"):
+                st.session_state.export_request = request
+        if st.session_state.get('export_request') != request:
+            return
+        
+        cache = get_export_cache()
+        monitor = get_perf_monitor()
+        mime, extension = DataExporter.FORMATS[fmt]
+        file_stem = re.sub(r'[^A-Za-z0-9_.-]+', '_', period).strip('_')
+        
+        with monitor.stage('export:records', rows=len(filtered_df), format=fmt):
+            records = cache.get_or_build(
+                ('records', *request) if version is not None else None,
+                lambda: DataExporter.write_records(filtered_df, fmt, Config.EXPORT_CHUNK_ROWS)
+            )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                f"⬇️ Records ({len(records) / 1024:,.0f} KB)", records,
+                file_name=f"luxquant_records_{file_stem}.{extension}", mime=mime,
+                key="download_records", use_container_width=True
+            )
+        if stats:
+            with monitor.stage('export:stats', format=fmt):
+                stats_file = cache.get_or_build(
+                    # The payload names the window, so equal positions under another label differ
+                    ('stats', *request, period) if version is not None else None,
+                    lambda: DataExporter.write_stats({'period': period, 'rows': len(filtered_df), **stats}, fmt)
+                )
+            with col2:
+                st.download_button(
+                    "⬇️ Statistics", stats_file,
+                    file_name=f"luxquant_stats_{file_stem}.{extension}", mime=mime,
+                    key="download_stats", use_container_width=True
+                )
+
+# ==================== BATCH MODE ====================
+class BatchRunner:
+    """Computes statistics and charts for every period without a Streamlit session"""
+    
+    PERIODS = ['week', 'month', 'all']
+    
+    # chart -> (height, margin), the desktop layout of the dashboard
+    CHART_LAYOUT = {
+        'combined': (700, dict(l=40, r=40, t=60, b=40)),
+        'winrate': (350, dict(l=40, r=40, t=50, b=40)),
+        'tpsl': (350, dict(l=40, r=40, t=50, b=40)),
+        'rolling': (500, dict(l=40, r=40, t=80, b=40)),
+    }
+    
+    def __init__(self, data_manager: DataManager, output_dir: str):
+        self.data_manager = data_manager
+        self.output_dir = Path(output_dir)
+    
+    def _write(self, relative_path: str, content: str):
+        """Write a file atomically so readers never see a partial artifact"""
+        path = self.output_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding='utf-8')
+        os.replace(tmp_path, path)
+    
+    def run(self, periods: Optional[List[str]] = None, html: bool = True,
+            max_points: Optional[int] = None) -> Dict[str, Any]:
+        """Load the snapshot, then write stats.json and one JSON (and HTML) file per chart and period"""
+        started = time.perf_counter()
+        df, _ = self.data_manager.load_snapshot()
+        if df is None or df.empty:
+            raise ValueError("No trading data available")
+        fetched_at = datetime.datetime.now()
+        
+        stats_index = AnalyticsEngine.build_stats_index(df)
+        rolling_metrics = AnalyticsEngine.build_rolling_metrics(df, stats_index)
+        budget = ChartBuilder._point_budget(max_points)
+        
+        report: Dict[str, Any] = {
+            'generated_at': fetched_at.isoformat(timespec='seconds'),
+            'rows': len(df),
+            'chart_point_budget': budget,
+            'periods': {},
+        }
+        for period in periods or self.PERIODS:
+            start, stop = stats_index.period_positions(period)
+            filtered_df = stats_index.take(df, start, stop)
+            dates = filtered_df['Date_parsed'].dropna() if 'Date_parsed' in filtered_df.columns else pd.Series([], dtype=object)
+            frames = {chart: filtered_df for chart in self.CHART_LAYOUT}
+            frames['rolling'] = rolling_metrics.frame(df, start, stop)
+            
+            charts = []
+            for chart, (height, margin) in self.CHART_LAYOUT.items():
+                fig = getattr(ChartBuilder, ChartBuilder.CHART_FACTORIES[chart])(frames[chart], max_points=budget)
+                if fig is None:
+                    continue
+                fig.update_layout(height=height, margin=margin)
+                self._write(f"figures/{period}_{chart}.json", fig.to_json())
+                if html:
+                    self._write(f"figures/{period}_{chart}.html", fig.to_html(include_plotlyjs='cdn'))
+                charts.append(chart)
+            
+            report['periods'][period] = {
+                'rows': stop - start,
+                'first_date': dates.min() if len(dates) else None,
+                'last_date': dates.max() if len(dates) else None,
+                'statistics': stats_index.statistics(start, stop),
+                'performance': rolling_metrics.summary(start, stop),
+                'charts': charts,
+            }
+        
+        report['duration_s'] = round(time.perf_counter() - started, 3)
+        self._write('stats.json', json.dumps(report, indent=2, default=str))
+        return report
+
+def batch_main(argv: Optional[List[str]] = None) -> int:
+    """Headless entry point: python app.py --output-dir artifacts"""
+    import argparse
+    import logging
+    
+    parser = argparse.ArgumentParser(description="Precompute LuxQuant statistics and chart artifacts")
+    parser.add_argument('--output-dir', default='artifacts', help="directory for stats.json and figures/")
+    parser.add_argument('--periods', nargs='+', choices=BatchRunner.PERIODS, default=BatchRunner.PERIODS)
+    parser.add_argument('--no-html', action='store_true', help="write figure JSON only")
+    parser.add_argument('--max-points', type=int, default=None,
+                        help="per-series point budget (default CHART_POINT_BUDGET, 0 for full resolution)")
+    args = parser.parse_args(argv)
+    
+    # Bare-mode Streamlit warnings are irrelevant without a session
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+    st.config.set_option('global.showWarningOnDirectExecution', False)
+    
+    source = create_resilient_source(create_data_source(DataManager().connect_to_gsheet))
+    runner = BatchRunner(DataManager(source), args.output_dir)
+    try:
+        report = runner.run(args.periods, html=not args.no_html, max_points=args.max_points)
+    except Exception as e:
+        print(f"❌ Batch run failed: {e}")
+        return 1
+    print(f"✅ Wrote stats and {sum(len(p['charts']) for p in report['periods'].values())} charts "
+          f"for {report['rows']:,} rows to {args.output_dir} in {report['duration_s']:.1f}s")
+    return 0
+
 # ==================== APPLICATION ENTRY POINT ====================
 def main():
     """Application entry point"""
@@ -1343,4 +4254,7 @@ def main():
     app.run()
 
 if __name__ == "__main__":
+    # `streamlit run app.py` serves the dashboard; plain `python app.py` runs the batch job
+    if get_script_run_ctx() is None:
+        sys.exit(batch_main())
     main()
@@ -0,0 +1,239 @@
+"""Offline benchmark suite for the LuxQuant data pipeline.
+
+Generates synthetic ``get_all_values()`` output, times each pipeline stage
+separately and records its peak memory. The cold import cost of ``app`` is
+measured in fresh interpreters. Results are written as JSON so runs can be
+compared across commits.
+
+    python benchmark.py                          # 1k, 10k, 100k and 1M rows
+    python benchmark.py --sizes 1000 10000 --repeat 5 --output bench.json
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+import app
+from app import AnalyticsEngine, ChartBuilder, DataManager
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+# Column names as DataManager._map_columns resolves them, plus a free-text column
+HEADER = ['Date', 'Total_Signal', 'Finished', 'TP', 'SL', 'Winrate_pct', 'Notes']
+
+# ==================== SYNTHETIC SHEET ====================
+def generate_sheet_values(n_rows: int, seed: int = 0, days: int = 3650) -> List[List[str]]:
+    """Build a header plus n_rows rows shaped like Worksheet.get_all_values() output.
+
+    Rows are spread evenly over ``days`` days ending today. The messy inputs that
+    the cleaners handle are mixed in: every supported date format, date ranges,
+    free-form and unparseable dates, ``%`` winrates, thousands separators in
+    counts, blank rows in the middle and trailing blank rows.
+    """
+    rng = random.Random(seed)
+    end = datetime.date.today()
+    start = end - datetime.timedelta(days=days)
+    width = len(HEADER)
+    rows = [list(HEADER)]
+
+    for i in range(n_rows):
+        day = start + datetime.timedelta(days=days * i // max(1, n_rows - 1))
+        fmt = rng.random()
+        if fmt < 0.55:
+            date = day.strftime('%Y-%m-%d')
+        elif fmt < 0.75:
+            date = f"{day.month}/{day.day}/{day.year}"
+        elif fmt < 0.85:
+            date = f"{day.month}-{day.day}-{day.year}"
+        elif fmt < 0.93:
+            range_start = day - datetime.timedelta(days=6)
+            date = f"{range_start:%m/%d}-{day:%m/%d}"
+        elif fmt < 0.99:
+            date = day.strftime('%b %d, %Y')
+        else:
+            date = rng.choice(['n/a', 'TBD', '??'])
+
+        total = rng.randint(5, 2500)
+        finished = rng.randint(0, total)
+        tp = rng.randint(0, finished)
+        sl = finished - tp
+        winrate = f"{100 * tp / finished:.1f}%" if finished else "0%"
+        row = [date, f"{total:,}", f"{finished:,}", f"{tp:,}", str(sl), winrate,
+               rng.choice(['', '', '', 'volatile day', 'news event'])]
+        rows.append(row)
+
+        # Occasional blank separator rows, as people leave in the sheet
+        if rng.random() < 0.002:
+            rows.append([''] * width)
+
+    rows.extend([[''] * width for _ in range(rng.randint(0, 20))])
+    return rows
+
+# ==================== MEASUREMENT ====================
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time fn over several runs and record the peak memory of one traced run"""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'median_s': statistics.median(durations),
+        'min_s': min(durations),
+        'max_s': max(durations),
+        'peak_mem_mb': peak / (1024 * 1024),
+    }
+
+def benchmark_import(repeat: int) -> List[Dict[str, Any]]:
+    """Time ``import app`` in fresh interpreters, in total and for its eager imports"""
+    script = (
+        "import sys, time; started = time.perf_counter(); import app; "
+        "print(time.perf_counter() - started, app.EAGER_IMPORT_SECONDS, "
+        "'plotly.express' in sys.modules, 'gspread' in sys.modules)"
+    )
+    totals, eager = [], []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', script], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.split()
+        totals.append(float(output[-4]))
+        eager.append(float(output[-3]))
+
+    result = {
+        'rows': 0,
+        'stage': 'import_app',
+        'median_s': statistics.median(totals),
+        'min_s': min(totals),
+        'max_s': max(totals),
+        'eager_imports_median_s': statistics.median(eager),
+        'heavy_modules_loaded': output[-2] == 'True' or output[-1] == 'True',
+    }
+    print(f"{'cold':>9}       {'import_app':<38} {result['median_s'] * 1000:>10.2f} ms")
+    return [result]
+
+def benchmark_size(n_rows: int, repeat: int, include_charts: bool, seed: int) -> List[Dict[str, Any]]:
+    """Time every pipeline stage for one synthetic sheet size"""
+    values = generate_sheet_values(n_rows, seed=seed)
+    data_manager = DataManager()
+    header, data_rows = values[0], values[1:]
+
+    def build_frame() -> pd.DataFrame:
+        last_index = data_manager._find_last_data_row(data_rows)
+        return pd.DataFrame(data_rows[:last_index + 1], columns=header)
+
+    raw_df = build_frame()
+    mapped_df = data_manager._map_columns(raw_df.copy())
+    df = data_manager._clean_dataframe(raw_df.copy())
+    memory = DataManager.memory_report(data_manager._clean_dataframe(raw_df.copy(), compact=False), df)
+    stats_index = AnalyticsEngine.build_stats_index(df)
+    rolling_metrics = AnalyticsEngine.build_rolling_metrics(df, stats_index)
+    chart_frames = {'rolling': rolling_metrics.frame(df, 0, len(df))}
+    filtered = {period: AnalyticsEngine.filter_data_by_period(df, period) for period in ['week', 'month', 'all']}
+
+    stages: Dict[str, Callable[[], Any]] = {
+        'build_frame': build_frame,
+        'clean_dataframe': lambda: data_manager._clean_dataframe(raw_df.copy()),
+        'process_dates': lambda: data_manager._process_dates(mapped_df.copy()),
+        'build_stats_index': lambda: AnalyticsEngine.build_stats_index(df),
+        'build_rolling_metrics': lambda: AnalyticsEngine.build_rolling_metrics(df, stats_index),
+        'rolling_summary[all]': lambda: rolling_metrics.summary(0, len(df)),
+        # A fresh table each run, so the sort order and search text are built too
+        'records_view[all, TP desc]': lambda: AnalyticsEngine.build_records_table(df, stats_index).view(0, len(df), 'TP'),
+        'records_search[all]': lambda: AnalyticsEngine.build_records_table(df, stats_index).view(0, len(df), query='-03-'),
+        'records_page[all]': lambda: AnalyticsEngine.build_records_table(df, stats_index).page(
+            np.arange(len(df))[::-1], (), 0, app.Config.RECORDS_PAGE_SIZE),
+    }
+    for fmt in app.DataExporter.available_formats():
+        stages[f'export_records[all, {fmt}]'] = lambda f=fmt: app.DataExporter.write_records(
+            df, f, app.Config.EXPORT_CHUNK_ROWS)
+    for period in ['week', 'month', 'all']:
+        stages[f'filter_data_by_period[{period}]'] = lambda p=period: AnalyticsEngine.filter_data_by_period(df, p)
+        stages[f'filter_with_index[{period}]'] = lambda p=period: AnalyticsEngine.filter_data_by_period(df, p, stats_index)
+        stages[f'calculate_statistics[{period}]'] = lambda p=period: AnalyticsEngine.calculate_statistics(filtered[p])
+        stages[f'calculate_period_statistics[{period}]'] = lambda p=period: AnalyticsEngine.calculate_period_statistics(stats_index, p)
+    year_end = datetime.date.today() - datetime.timedelta(days=365)
+    year_start = year_end - datetime.timedelta(days=365)
+    stages['filter_window[range 1y]'] = lambda: stats_index.take(df, *AnalyticsEngine.window_positions(
+        stats_index, 'range', start_date=year_start, end_date=year_end))
+    stages['filter_window[trailing 90d]'] = lambda: stats_index.take(df, *AnalyticsEngine.window_positions(
+        stats_index, 'trailing', days=90))
+    if include_charts:
+        stages['chart_fingerprint[all]'] = lambda: ChartBuilder.fingerprint(df)
+        for chart, factory in ChartBuilder.CHART_FACTORIES.items():
+            stages[f'chart_{chart}[all]'] = lambda f=factory, c=chart: getattr(ChartBuilder, f)(chart_frames.get(c, df))
+
+    results = [{'rows': n_rows, 'stage': 'memory_report', **memory}]
+    print(f"{n_rows:>9,} rows  {'snapshot memory (before -> after)':<38} "
+          f"{memory['before_bytes'] / 2**20:>8.1f} MB -> {memory['after_bytes'] / 2**20:.1f} MB "
+          f"({memory['saved_pct']:.0f}% smaller)", flush=True)
+    for stage, fn in stages.items():
+        result = {'rows': n_rows, 'stage': stage, **measure(fn, repeat)}
+        results.append(result)
+        print(f"{n_rows:>9,} rows  {stage:<38} {result['median_s'] * 1000:>10.2f} ms  "
+              f"{result['peak_mem_mb']:>8.1f} MB peak", flush=True)
+    return results
+
+def run_metadata() -> Dict[str, Any]:
+    """Describe the code and environment the results were produced with"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'chart_point_budget': app.Config.CHART_POINT_BUDGET,
+    }
+
+# ==================== ENTRY POINT ====================
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the LuxQuant data pipeline offline")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="row counts to benchmark")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the synthetic sheet")
+    parser.add_argument('--skip-charts', action='store_true', help="skip Plotly figure construction")
+    parser.add_argument('--output', default='bench_results.json', help="where to write JSON results")
+    args = parser.parse_args(argv)
+
+    # Bare-mode Streamlit and free-form date parsing are noisy and irrelevant here
+    warnings.filterwarnings('ignore')
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    results = benchmark_import(args.repeat)
+    for n_rows in args.sizes:
+        results.extend(benchmark_size(n_rows, args.repeat, not args.skip_charts, args.seed))
+
+    with open(args.output, 'w') as f:
+        json.dump({'meta': run_metadata(), 'results': results}, f, indent=2)
+    print(f"✅ Wrote {len(results)} results to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
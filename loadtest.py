@@ -0,0 +1,275 @@
+"""Concurrent-session load test for the LuxQuant dashboard.
+
+Drives the real ``app.py`` script through Streamlit's ``AppTest`` API against
+the offline fake data source. Each simulated viewer keeps its own session and
+repeatedly picks a period and clicks LOAD; all sessions share one process, so
+the snapshot, figure and export caches are shared exactly as on a server.
+Reports throughput, end-to-end render latency percentiles, per-stage latency
+from the app's own traces and the growth of the process's resident memory.
+
+    python loadtest.py                                   # 1, 5 and 10 sessions
+    python loadtest.py --sessions 10 25 50 --iterations 20 --output load.json
+
+Render times include AppTest's parsing of the produced elements, so they are
+an upper bound of the server-side time for a rerun.
+"""
+import argparse
+import csv
+import datetime
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from typing import Any, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(HERE, 'app.py')
+DEFAULT_SESSIONS = [1, 5, 10]
+# Radio options of UIComponents.render_period_selector; range needs a date picker
+PERIODS = ['week', 'month', 'all', 'trailing']
+
+# ==================== MEASUREMENT ====================
+def rss_mb() -> float:
+    """Current resident set size of this process, or the peak where /proc is unavailable"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def percentiles(values: List[float]) -> Dict[str, Optional[float]]:
+    """p50/p95/p99/max of a list of durations in ms"""
+    if not values:
+        return {'p50_ms': None, 'p95_ms': None, 'p99_ms': None, 'max_ms': None}
+    ordered = sorted(values)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        'p50_ms': round(statistics.median(ordered), 2),
+        'p95_ms': round(pick(0.95), 2),
+        'p99_ms': round(pick(0.99), 2),
+        'max_ms': round(ordered[-1], 2),
+    }
+
+def share_test_runtime():
+    """Let AppTest runs overlap in threads.
+
+    AppTest installs a mock Runtime for each run and resets it to None afterwards,
+    so a session finishing its run breaks every script still running. Any run that
+    finds the slot empty falls back to one long-lived mock runtime instead.
+
+    Every AppTest run also compiles the script again, and concurrent compiles can
+    fail on CPython 3.11 ("AST constructor recursion depth mismatch"). Compiles
+    are serialized; a server compiles the script once and shares the bytecode.
+    """
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    fallback = MagicMock(spec=Runtime)
+    fallback.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    fallback.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: cls._instance if cls._instance is not None else fallback)
+    Runtime.exists = classmethod(lambda cls: True)
+
+    compile_lock = threading.Lock()
+    get_bytecode = ScriptCache.get_bytecode
+
+    def get_bytecode_serialized(self, script_path):
+        with compile_lock:
+            return get_bytecode(self, script_path)
+
+    ScriptCache.get_bytecode = get_bytecode_serialized
+
+# ==================== SESSIONS ====================
+class Session:
+    """One simulated viewer with its own AppTest session state"""
+
+    def __init__(self, session_id: int, iterations: int, think_seconds: float, seed: int, timeout: float):
+        from streamlit.testing.v1 import AppTest
+
+        self.session_id = session_id
+        self.iterations = iterations
+        self.think_seconds = think_seconds
+        self.random = random.Random(seed * 1000 + session_id)
+        self.app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.samples: List[Dict[str, Any]] = []
+
+    def _select(self, period: str):
+        """Pick the period; select boxes are re-pinned to their first option.
+
+        AppTest reads formatted options back as values, so widgets using
+        format_func must be set explicitly before every run.
+        """
+        radio = self.app.radio(key='period_selector')
+        radio.set_value(radio.options[['week', 'month', 'all', 'range', 'trailing'].index(period)])
+        for select in self.app.selectbox:
+            select.set_value(select.options[0])
+
+    def run(self):
+        started = time.perf_counter()
+        self.app.run()
+        self.samples.append({'kind': 'first_render', 'ms': (time.perf_counter() - started) * 1000})
+
+        for _ in range(self.iterations):
+            if not self.app.radio:
+                # The previous run rendered nothing (reported as an error); start over
+                self.app.run()
+            period = self.random.choice(PERIODS)
+            self._select(period)
+            load = next(button for button in self.app.button if 'LOAD' in button.label)
+            started = time.perf_counter()
+            error = None
+            try:
+                load.click().run()
+                if self.app.exception:
+                    error = self.app.exception[0].value
+                elif self.app.error:
+                    error = self.app.error[0].value
+                elif not self.app.radio:
+                    error = "empty render"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            self.samples.append({
+                'kind': 'load',
+                'period': period,
+                'ms': (time.perf_counter() - started) * 1000,
+                'error': error,
+                'trace': list(self.app.session_state['perf_trace'])
+                if 'perf_trace' in self.app.session_state else [],
+            })
+            if self.think_seconds:
+                time.sleep(self.random.uniform(0, 2 * self.think_seconds))
+
+def run_level(n_sessions: int, iterations: int, think_seconds: float, seed: int, timeout: float) -> Dict[str, Any]:
+    """Run n_sessions viewers concurrently and summarise their loads"""
+    sessions = [Session(i, iterations, think_seconds, seed, timeout) for i in range(n_sessions)]
+    rss_before = rss_mb()
+    threads = [threading.Thread(target=s.run, name=f"session-{s.session_id}") for s in sessions]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    rss_after = rss_mb()
+
+    samples = [sample for s in sessions for sample in s.samples]
+    loads = [sample for sample in samples if sample['kind'] == 'load']
+    errors = [sample['error'] for sample in loads if sample['error']]
+
+    stage_ms: Dict[str, List[float]] = {}
+    for sample in loads:
+        for record in sample['trace']:
+            stage_ms.setdefault(record['stage'], []).append(record['duration_ms'])
+
+    result = {
+        'sessions': n_sessions,
+        'loads': len(loads),
+        'errors': len(errors),
+        'error_examples': sorted(set(errors))[:5],
+        'duration_s': round(elapsed, 3),
+        'throughput_loads_per_s': round(len(loads) / elapsed, 2) if elapsed else None,
+        **percentiles([sample['ms'] for sample in loads]),
+        'first_render': percentiles([sample['ms'] for sample in samples if sample['kind'] == 'first_render']),
+        'by_period': {
+            period: percentiles([sample['ms'] for sample in loads if sample['period'] == period])
+            for period in PERIODS
+        },
+        'stages': {stage: percentiles(values) for stage, values in sorted(stage_ms.items())},
+        'rss_before_mb': round(rss_before, 1),
+        'rss_after_mb': round(rss_after, 1),
+        'rss_growth_mb': round(rss_after - rss_before, 1),
+    }
+    print(f"{n_sessions:>5} sessions  {len(loads):>5} loads  {result['throughput_loads_per_s'] or 0:>7.2f} loads/s  "
+          f"p50 {result['p50_ms'] or 0:>8.1f} ms  p95 {result['p95_ms'] or 0:>8.1f} ms  "
+          f"p99 {result['p99_ms'] or 0:>8.1f} ms  errors {len(errors):>3}  "
+          f"RSS {rss_before:,.0f} -> {rss_after:,.0f} MB", flush=True)
+    return result
+
+# ==================== ENTRY POINT ====================
+def configure_environment(args: argparse.Namespace) -> str:
+    """Point the app at the offline fake source; returns the CSV path it reads"""
+    data_path = args.data_path
+    if data_path is None:
+        from benchmark import generate_sheet_values
+
+        data_path = os.path.join(tempfile.mkdtemp(prefix='luxquant_load_'), 'sheet.csv')
+        with open(data_path, 'w', newline='') as f:
+            csv.writer(f).writerows(generate_sheet_values(args.rows, seed=args.seed))
+
+    os.environ.update({
+        'DATA_SOURCE': 'fake',
+        'DATA_SOURCE_PATH': data_path,
+        'FAKE_LATENCY_MS': str(args.latency_ms),
+        'FAKE_ERROR_RATE': str(args.error_rate),
+        'SNAPSHOT_PATH': '',
+        'PERF_LOG': '0',
+    })
+    return data_path
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test the LuxQuant dashboard with concurrent sessions")
+    parser.add_argument('--sessions', type=int, nargs='+', default=DEFAULT_SESSIONS,
+                        help="concurrent session counts to run, one level each")
+    parser.add_argument('--iterations', type=int, default=10, help="LOAD clicks per session")
+    parser.add_argument('--think-ms', type=float, default=0, help="mean pause between clicks")
+    parser.add_argument('--rows', type=int, default=10_000, help="rows in the generated sheet")
+    parser.add_argument('--data-path', default=None, help="existing CSV to serve instead of a generated one")
+    parser.add_argument('--latency-ms', type=float, default=50, help="fake source latency per read")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fake source transient error rate")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds before one script run fails")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the sheet and the period mix")
+    parser.add_argument('--output', default='loadtest_results.json', help="where to write JSON results")
+    args = parser.parse_args(argv)
+
+    # Bare-mode Streamlit and free-form date parsing are noisy and irrelevant here
+    warnings.filterwarnings('ignore')
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    data_path = configure_environment(args)
+    share_test_runtime()
+    rss_start = rss_mb()
+
+    results = [run_level(n, args.iterations, args.think_ms / 1000, args.seed, args.timeout)
+               for n in args.sessions]
+
+    meta = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'data_path': data_path,
+        'rows': args.rows if args.data_path is None else None,
+        'fake_latency_ms': args.latency_ms,
+        'iterations_per_session': args.iterations,
+        'rss_start_mb': round(rss_start, 1),
+        'rss_end_mb': round(rss_mb(), 1),
+    }
+    with open(args.output, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f"✅ Wrote {len(results)} load levels to {args.output} "
+          f"(RSS {meta['rss_start_mb']:,.0f} -> {meta['rss_end_mb']:,.0f} MB)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())